@@ -1,6 +1,7 @@
 """Application configuration"""
+from functools import cached_property
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -22,6 +23,10 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str
+    DB_POOL_SIZE: int = 20  # Persistent connections per worker process
+    DB_MAX_OVERFLOW: int = 20  # Extra connections allowed under burst load
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a pooled connection is replaced
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection before failing
 
     # Google OAuth
     GOOGLE_CLIENT_ID: str
@@ -33,6 +38,20 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 43200  # 30 days (30 * 24 * 60)
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30  # Also increased to 30 days
+    JWT_CACHE_TTL: int = 30  # Seconds a verified access token stays cached
+    JWT_CACHE_MAX: int = 10000  # Max number of cached verified tokens
+    USER_CACHE_TTL: int = 60  # Seconds an authenticated user row stays cached
+    USER_CACHE_MAX: int = 5000  # Max number of cached users
+
+    # Shared cache (Redis is optional; without it each worker caches in-process)
+    REDIS_URL: Optional[str] = None  # e.g. redis://localhost:6379/0
+    REDIS_SOCKET_TIMEOUT: float = 0.5  # Seconds before a Redis call is treated as a miss
+    SHARED_CACHE_MAX: int = 10000  # Max entries in the in-process fallback
+    SHARED_CACHE_ONCE_MAX: int = 10000  # Max pending single-use entries (OAuth states) in the fallback
+    ACL_CACHE_TTL: int = 60  # Seconds a user's project role stays cached
+    USER_EMAIL_CACHE_TTL: int = 86400  # Seconds an email -> user ID mapping stays cached
+    ZONE_GEOJSON_CACHE_TTL: int = 86400  # Seconds a zone's serialized GeoJSON stays cached
+    METRICS_CACHE_TTL: int = 10  # Seconds /metrics and /health/detailed reuse record counts
 
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000"
@@ -41,9 +60,9 @@ class Settings(BaseSettings):
         env_file = ".env"
         case_sensitive = True
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> List[str]:
-        """Parse CORS origins from comma-separated string"""
+        """Parse CORS origins from comma-separated string (computed once)"""
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
 
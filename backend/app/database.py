@@ -8,8 +8,11 @@ from app.config import settings
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,  # Verify connections before using
-    pool_size=5,
-    max_overflow=10,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,  # size + overflow matches the 40-thread threadpool
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_timeout=settings.DB_POOL_TIMEOUT,  # Fail fast instead of queueing forever when exhausted
+    pool_use_lifo=True,  # Reuse hot connections so idle ones can age out
     echo=settings.DEBUG  # Log SQL queries in debug mode
 )
 
@@ -6,12 +6,14 @@ from typing import Optional
 from app.database import get_db
 from app.models.user import User
 from app.utils.security import get_user_id_from_token
+from app.utils.auth_cache import load_user, verify_and_load
 
-# Security scheme for Bearer token
+# Security schemes for Bearer token (shared singletons)
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
-async def get_current_user(
+def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
@@ -40,8 +42,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    # Get user from cache or database
+    user = load_user(user_id, db)
 
     if not user:
         raise HTTPException(
@@ -53,8 +55,8 @@ async def get_current_user(
     return user
 
 
-async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+def get_current_user_optional(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
     db: Session = Depends(get_db)
 ) -> Optional[User]:
     """
@@ -72,11 +74,4 @@ async def get_current_user_optional(
     if not credentials:
         return None
 
-    token = credentials.credentials
-    user_id = get_user_id_from_token(token)
-
-    if not user_id:
-        return None
-
-    user = db.query(User).filter(User.id == user_id).first()
-    return user
+    return verify_and_load(credentials.credentials, db)
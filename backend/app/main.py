@@ -1,11 +1,16 @@
 """Main FastAPI application"""
 # Updated: Added notes and manual_completion_percentage to zone assignments
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
-from app.utils.logging_config import setup_logging
+from app.services.oauth_service import google_oauth_service
+from app.utils.logging_config import setup_logging, stop_logging
+from app.utils.shared_cache import SHARED_ACROSS_WORKERS
 
 # Initialize logging
 setup_logging()
@@ -13,7 +18,24 @@ logger = logging.getLogger(__name__)
 
 # Track server start time
 SERVER_START_TIME = datetime.utcnow()
-logger.info(f"Server starting at {SERVER_START_TIME.isoformat()}")
+SERVER_START_TIME_ISO = SERVER_START_TIME.isoformat()
+logger.info(f"Server starting at {SERVER_START_TIME_ISO}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup/shutdown hooks"""
+    # Build the OpenAPI schema once so the first /docs hit doesn't pay for it
+    app.openapi()
+    # uvloop.Loop when uvicorn[standard] is installed, asyncio's loop otherwise
+    logger.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
+    # OAuth states and shared caches are per-process without Redis (project access is then not cached)
+    if not SHARED_ACROSS_WORKERS:
+        logger.warning("REDIS_URL is not set but multiple workers are running; Google logins may fail across workers")
+    yield
+    await google_oauth_service.aclose()
+    stop_logging()
+
 
 # Create FastAPI application
 app = FastAPI(
@@ -22,7 +44,9 @@ app = FastAPI(
     description="API for managing volunteer flyer distribution",
     docs_url=f"{settings.API_V1_PREFIX}/docs",
     redoc_url=f"{settings.API_V1_PREFIX}/redoc",
-    openapi_url=f"{settings.API_V1_PREFIX}/openapi.json"
+    openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 
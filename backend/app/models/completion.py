@@ -1,10 +1,8 @@
 """Completion tracking models"""
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, text, func
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geometry
-from datetime import datetime
-import uuid
 
 from app.database import Base
 
@@ -16,18 +14,22 @@ class CompletionArea(Base):
     """
     __tablename__ = "completion_areas"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"), index=True)
     assignment_id = Column(UUID(as_uuid=True), ForeignKey("zone_assignments.id", ondelete="CASCADE"), nullable=False)
 
     # Geometry representing the completed area (Point, LineString, or Polygon)
     # SRID 4326 = WGS84 (standard GPS coordinates)
-    geometry = Column(Geometry(geometry_type='GEOMETRY', srid=4326), nullable=False)
+    geometry = Column(Geometry(geometry_type='GEOMETRY', srid=4326, spatial_index=False), nullable=False)
 
     # When this area was marked as complete
-    completed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    completed_at = Column(DateTime, server_default=func.now(), nullable=False)
 
     # Optional notes from the volunteer
     notes = Column(String, nullable=True)
 
     # Relationship to assignment
     assignment = relationship("ZoneAssignment", back_populates="completion_areas")
+
+    __table_args__ = (
+        Index("idx_completion_areas_geometry", geometry, postgresql_using="gist"),
+    )
@@ -1,7 +1,5 @@
 """Project model"""
-import uuid
-from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Enum, Index, text, func, FetchedValue
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -27,14 +25,14 @@ class Project(Base):
 
     __tablename__ = "projects"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     name = Column(String(255), nullable=False)
     description = Column(String, nullable=True)
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     status = Column(Enum(ProjectStatus, values_callable=lambda x: [e.value for e in x]), nullable=False, default=ProjectStatus.IN_PROGRESS)
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
 
     # Relationships
     owner = relationship("User", foreign_keys=[owner_id], backref="owned_projects")
@@ -47,14 +45,20 @@ class ProjectCollaborator(Base):
 
     __tablename__ = "project_collaborators"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     role = Column(Enum(CollaboratorRole, values_callable=lambda x: [e.value for e in x]), nullable=False, default=CollaboratorRole.PROJECT_VIEWER)
     invited_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    invited_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    invited_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     # Relationships
     project = relationship("Project", back_populates="collaborators")
     user = relationship("User", foreign_keys=[user_id], backref="project_collaborations")
     inviter = relationship("User", foreign_keys=[invited_by])
+
+    __table_args__ = (
+        # Backs the (project_id, user_id) lookup in every project access check;
+        # INCLUDE (role) lets the index answer the role check without a heap fetch
+        Index("idx_project_collaborators_project_user", project_id, user_id, unique=True, postgresql_include=["role"]),
+    )
@@ -1,8 +1,6 @@
 """User model"""
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, String, DateTime, Index, text, func, FetchedValue
 from sqlalchemy.dialects.postgresql import UUID
-from datetime import datetime
-import uuid
 from app.database import Base
 
 
@@ -11,15 +9,20 @@ class User(Base):
 
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    google_id = Column(String(255), unique=True, nullable=True, index=True)  # Nullable for email/password users
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    google_id = Column(String(255), unique=True, nullable=True)  # Nullable for email/password users
+    email = Column(String(255), unique=True, nullable=False)
     name = Column(String(255), nullable=False)
     password_hash = Column(String, nullable=True)  # For email/password authentication
     picture_url = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
-    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue(), nullable=False)
     last_login = Column(DateTime(timezone=True), nullable=True)
 
+    __table_args__ = (
+        # Email lookups match case-insensitively; the unique constraints already index google_id and email
+        Index("idx_users_email_lower", func.lower(email), unique=True),
+    )
+
     def __repr__(self):
         return f"<User(id={self.id}, email={self.email}, name={self.name})>"
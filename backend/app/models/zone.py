@@ -1,10 +1,8 @@
 """Zone model for database operations"""
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Integer, Float, Boolean, Index, text, func, false, FetchedValue
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from geoalchemy2 import Geometry
-from datetime import datetime
-import uuid
 
 from app.database import Base
 
@@ -14,37 +12,42 @@ class Zone(Base):
 
     __tablename__ = "zones"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     name = Column(String(255), nullable=False)
     description = Column(Text)
-    geometry = Column(Geometry(geometry_type='POLYGON', srid=4326), nullable=False)
+    geometry = Column(Geometry(geometry_type='POLYGON', srid=4326, spatial_index=False), nullable=False)
     color = Column(String(7))  # Hex color (e.g., #FF5733)
     kml_metadata = Column(JSONB)  # Additional KML metadata
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
-    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
 
     # Relationships
     project = relationship("Project", back_populates="zones")
     assignments = relationship("ZoneAssignment", back_populates="zone", cascade="all, delete-orphan")
     houses = relationship("House", back_populates="zone", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("idx_zones_geometry", geometry, postgresql_using="gist"),
+    )
+
 
 class ZoneAssignment(Base):
     """Zone assignment model - assigns volunteers to zones"""
 
     __tablename__ = "zone_assignments"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     zone_id = Column(UUID(as_uuid=True), ForeignKey("zones.id", ondelete="CASCADE"), nullable=False)
     volunteer_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     assigned_by = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    assigned_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    assigned_at = Column(DateTime(timezone=True), server_default=func.now())
     status = Column(String(50), default='assigned')  # assigned, in_progress, completed
     started_at = Column(DateTime(timezone=True))
     completed_at = Column(DateTime(timezone=True))
     notes = Column(Text)  # Zone-level notes from volunteer
     manual_completion_percentage = Column(Integer)  # Manual override for completion percentage (0-100)
+    completed_area_sqm = Column(Float, nullable=False, server_default=text("0"))  # Union of completion areas, maintained by the completions router
 
     # Relationships
     zone = relationship("Zone", back_populates="assignments")
@@ -53,53 +56,71 @@ class ZoneAssignment(Base):
     completion_areas = relationship("CompletionArea", back_populates="assignment", cascade="all, delete-orphan")
     notes_list = relationship("AssignmentNote", back_populates="assignment", cascade="all, delete-orphan", order_by="AssignmentNote.created_at.desc()")
 
+    __table_args__ = (
+        Index("idx_zone_assignments_zone_volunteer_status", zone_id, volunteer_id, status),
+        Index("idx_zone_assignments_volunteer_status", volunteer_id, status),
+        Index(
+            "idx_zone_assignments_active_unique", zone_id, volunteer_id,
+            unique=True, postgresql_where=status != 'completed'
+        ),
+    )
+
 
 class AssignmentNote(Base):
     """Assignment notes with user attribution and timestamps"""
 
     __tablename__ = "assignment_notes"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     assignment_id = Column(UUID(as_uuid=True), ForeignKey("zone_assignments.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     content = Column(Text, nullable=False)
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
-    updated_at = Column(DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), server_onupdate=FetchedValue())
 
     # Relationships
     assignment = relationship("ZoneAssignment", back_populates="notes_list")
     author = relationship("User", foreign_keys=[user_id])
 
+    __table_args__ = (
+        # Notes are always listed per assignment, newest first
+        Index("idx_assignment_notes_assignment_created", assignment_id, created_at.desc()),
+    )
+
 
 class House(Base):
     """House model - represents individual houses within a zone"""
 
     __tablename__ = "houses"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     zone_id = Column(UUID(as_uuid=True), ForeignKey("zones.id", ondelete="CASCADE"), nullable=False)
-    location = Column(Geometry(geometry_type='POINT', srid=4326), nullable=False)
+    location = Column(Geometry(geometry_type='POINT', srid=4326, spatial_index=False), nullable=False)
     address = Column(Text)
     house_metadata = Column(JSONB)
-    created_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
     zone = relationship("Zone", back_populates="houses")
     visits = relationship("HouseVisit", back_populates="house", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("idx_houses_location", location, postgresql_using="gist"),
+    )
+
 
 class HouseVisit(Base):
     """House visit model - tracks which houses have been visited"""
 
     __tablename__ = "house_visits"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     house_id = Column(UUID(as_uuid=True), ForeignKey("houses.id", ondelete="CASCADE"), nullable=False)
     zone_assignment_id = Column(UUID(as_uuid=True), ForeignKey("zone_assignments.id", ondelete="CASCADE"), nullable=False)
     volunteer_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    visited_at = Column(DateTime(timezone=True), default=datetime.utcnow)
+    visited_at = Column(DateTime(timezone=True), server_default=func.now())
     notes = Column(Text)
-    offline_sync = Column(String(50), default=False)
+    offline_sync = Column(Boolean, nullable=False, server_default=false())
 
     # Relationships
     house = relationship("House", back_populates="visits")
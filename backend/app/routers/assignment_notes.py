@@ -1,7 +1,8 @@
 """Assignment notes routes - allows volunteers to add/edit/delete notes on their assignments"""
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.orm import Session, joinedload
 from typing import List
 from uuid import UUID
 
@@ -19,9 +20,34 @@ from app.routers.assignments import check_assignment_access
 router = APIRouter(prefix="/assignment-notes", tags=["assignment-notes"])
 logger = logging.getLogger(__name__)
 
+# Built once at import so every request hits SQLAlchemy's compiled statement cache
+_select_assignment_notes = select(AssignmentNote)\
+    .options(joinedload(AssignmentNote.author))\
+    .where(AssignmentNote.assignment_id == bindparam("assignment_id"))\
+    .order_by(AssignmentNote.created_at.desc())
+
+
+def _raise_note_not_writable(note_id: UUID, db: Session, forbidden_detail: str) -> None:
+    """
+    Raise the right error after an author-scoped UPDATE/DELETE matched no rows
+
+    Raises:
+        HTTPException: 404 if the note doesn't exist, 403 if it belongs to someone else
+    """
+    if db.query(AssignmentNote.id).filter(AssignmentNote.id == note_id).first() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Note not found"
+        )
+
+    raise HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail=forbidden_detail
+    )
+
 
 @router.get("/assignments/{assignment_id}/notes", response_model=List[AssignmentNoteResponse])
-async def get_assignment_notes(
+def get_assignment_notes(
     assignment_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -30,33 +56,15 @@ async def get_assignment_notes(
     # Check user has access to this assignment
     check_assignment_access(assignment_id, current_user, db)
 
-    # Get notes ordered by creation date (newest first)
-    notes = db.query(AssignmentNote)\
-        .filter(AssignmentNote.assignment_id == assignment_id)\
-        .order_by(AssignmentNote.created_at.desc())\
-        .all()
-
-    # Enrich with author details
-    result = []
-    for note in notes:
-        author = db.query(User).filter(User.id == note.user_id).first()
-        result.append({
-            "id": note.id,
-            "assignment_id": note.assignment_id,
-            "user_id": note.user_id,
-            "content": note.content,
-            "created_at": note.created_at,
-            "updated_at": note.updated_at,
-            "author_name": author.name if author else "Unknown",
-            "author_email": author.email if author else "",
-            "author_picture_url": author.picture_url if author else None
-        })
-
-    return result
+    # Get notes ordered by creation date (newest first), with authors in the same query
+    notes = db.scalars(_select_assignment_notes, {"assignment_id": assignment_id}).all()
+
+    # Author details are read from note.author by AssignmentNoteResponse
+    return notes
 
 
 @router.post("/assignments/{assignment_id}/notes", response_model=AssignmentNoteResponse)
-async def create_assignment_note(
+def create_assignment_note(
     assignment_id: UUID,
     note_data: AssignmentNoteCreate,
     db: Session = Depends(get_db),
@@ -79,84 +87,56 @@ async def create_assignment_note(
 
     logger.info(f"Note created for assignment {assignment_id} by {current_user.name}")
 
-    return {
-        "id": note.id,
-        "assignment_id": note.assignment_id,
-        "user_id": note.user_id,
-        "content": note.content,
-        "created_at": note.created_at,
-        "updated_at": note.updated_at,
-        "author_name": current_user.name,
-        "author_email": current_user.email,
-        "author_picture_url": current_user.picture_url
-    }
+    # note.author is current_user, already in the session's identity map
+    return note
 
 
 @router.patch("/notes/{note_id}", response_model=AssignmentNoteResponse)
-async def update_assignment_note(
+def update_assignment_note(
     note_id: UUID,
     note_data: AssignmentNoteUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update a note (only the author can edit)"""
-    note = db.query(AssignmentNote).filter(AssignmentNote.id == note_id).first()
+    # Ownership is enforced by the WHERE clause; the updated row comes back via RETURNING
+    note = db.scalars(
+        update(AssignmentNote)
+        .where(AssignmentNote.id == note_id, AssignmentNote.user_id == current_user.id)
+        .values(content=note_data.content)
+        .returning(AssignmentNote)
+    ).first()
 
     if not note:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Note not found"
-        )
-
-    # Only the author can edit their own note
-    if note.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only edit your own notes"
-        )
+        _raise_note_not_writable(note_id, db, "You can only edit your own notes")
 
-    note.content = note_data.content
+    # Serialize before commit expires the returned row, which would cost a refresh SELECT;
+    # note.author is current_user, already in the session's identity map
+    response = AssignmentNoteResponse.model_validate(note)
     db.commit()
-    db.refresh(note)
 
     logger.info(f"Note {note_id} updated by {current_user.name}")
 
-    return {
-        "id": note.id,
-        "assignment_id": note.assignment_id,
-        "user_id": note.user_id,
-        "content": note.content,
-        "created_at": note.created_at,
-        "updated_at": note.updated_at,
-        "author_name": current_user.name,
-        "author_email": current_user.email,
-        "author_picture_url": current_user.picture_url
-    }
+    return response
 
 
 @router.delete("/notes/{note_id}")
-async def delete_assignment_note(
+def delete_assignment_note(
     note_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete a note (only the author can delete)"""
-    note = db.query(AssignmentNote).filter(AssignmentNote.id == note_id).first()
+    # Ownership is enforced by the WHERE clause, so this is a single round trip
+    deleted_id = db.execute(
+        delete(AssignmentNote)
+        .where(AssignmentNote.id == note_id, AssignmentNote.user_id == current_user.id)
+        .returning(AssignmentNote.id)
+    ).scalar()
 
-    if not note:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Note not found"
-        )
-
-    # Only the author can delete their own note
-    if note.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only delete your own notes"
-        )
+    if deleted_id is None:
+        _raise_note_not_writable(note_id, db, "You can only delete your own notes")
 
-    db.delete(note)
     db.commit()
 
     logger.info(f"Note {note_id} deleted by {current_user.name}")
@@ -1,11 +1,13 @@
 """Zone assignment routes"""
 import logging
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, case, func, inspect, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, defer, joinedload, load_only
 from typing import List, Optional
 from uuid import UUID
-from datetime import datetime
-import json
+import orjson
 
 from app.database import get_db
 from app.models import Zone, Project, User
@@ -19,10 +21,12 @@ from app.schemas.assignment import (
     AssignmentResponse,
     AssignmentWithVolunteer,
     AssignmentWithZone,
-    VolunteerInfo
+    VolunteerInfo,
+    ASSIGNMENT_WITH_VOLUNTEER_LIST
 )
 from app.routers.auth import get_current_user
-from app.routers.projects import check_project_access
+from app.routers.projects import check_project_access, check_project_permissions, require_project_role
+from app.utils.zone_geojson import get_zone_geojson
 
 router = APIRouter(prefix="/assignments", tags=["assignments"])
 logger = logging.getLogger(__name__)
@@ -49,7 +53,11 @@ def check_assignment_access(
     Raises:
         HTTPException: 404 if not found, 403 if no access
     """
-    assignment = db.query(ZoneAssignment).filter(ZoneAssignment.id == assignment_id).first()
+    # Zone and project are loaded in the same query so callers don't re-fetch them
+    assignment = db.query(ZoneAssignment)\
+        .options(joinedload(ZoneAssignment.zone).defer(Zone.geometry).joinedload(Zone.project))\
+        .filter(ZoneAssignment.id == assignment_id)\
+        .first()
 
     if not assignment:
         raise HTTPException(
@@ -66,20 +74,12 @@ def check_assignment_access(
             )
         return assignment
 
-    # Otherwise, check if user has access to the project
-    zone = db.query(Zone).filter(Zone.id == assignment.zone_id).first()
-    if not zone:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Zone not found"
-        )
-
     # Check if user is the volunteer OR has project access
     if assignment.volunteer_id == user.id:
         return assignment
 
-    # Check project access
-    check_project_access(zone.project_id, user, db)
+    # Check project access against the eager-loaded project
+    check_project_permissions(assignment.zone.project, user, db)
     return assignment
 
 
@@ -93,55 +93,198 @@ def check_can_assign_volunteers(project_id: UUID, user: User, db: Session) -> Pr
     Raises:
         HTTPException: 404 if not found, 403 if no access
     """
-    return check_project_access(project_id, user, db, CollaboratorRole.ORGANIZER)
+    project, _ = check_project_access(project_id, user, db, CollaboratorRole.ORGANIZER)
+    return project
+
+
+# Volunteer status changes allowed from each status
+ALLOWED_STATUS_TRANSITIONS = {
+    'assigned': ['in_progress'],
+    'in_progress': ['assigned', 'completed'],
+    'completed': ['in_progress']  # Allow reactivating completed zones
+}
+
+# Partial unique index allowing one non-completed assignment per volunteer and zone
+_ACTIVE_ASSIGNMENT_INDEX = "idx_zone_assignments_active_unique"
+
+
+def _is_active_assignment_conflict(error: IntegrityError) -> bool:
+    """Whether an IntegrityError was raised by the active-assignment unique index"""
+    diag = getattr(error.orig, "diag", None)
+    return getattr(diag, "constraint_name", None) == _ACTIVE_ASSIGNMENT_INDEX
+
+
+def _raise_for_assignment_conflict(error: IntegrityError) -> None:
+    """
+    Turn an active-assignment unique index violation into the API's error response
+
+    The caller rolls back first; any other integrity error is re-raised unchanged.
+
+    Raises:
+        HTTPException: 400 if the volunteer already has an active assignment on the zone
+    """
+    if not _is_active_assignment_conflict(error):
+        raise error
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="This volunteer is already assigned to this zone"
+    )
+
+
+# Response builders
+
+# Plain assignment columns shared by every assignment response
+_ASSIGNMENT_FIELDS = tuple(AssignmentResponse.model_fields)
+
+
+# Columns list endpoints need (the fields of AssignmentResponse)
+_ASSIGNMENT_LIST_COLUMNS = load_only(
+    ZoneAssignment.id,
+    ZoneAssignment.zone_id,
+    ZoneAssignment.volunteer_id,
+    ZoneAssignment.assigned_by,
+    ZoneAssignment.assigned_at,
+    ZoneAssignment.status,
+    ZoneAssignment.started_at,
+    ZoneAssignment.completed_at,
+    ZoneAssignment.notes,
+    ZoneAssignment.manual_completion_percentage
+)
+
+
+# Volunteers joined in with only the columns responses show
+_VOLUNTEER_SUMMARY = joinedload(ZoneAssignment.volunteer)\
+    .load_only(User.id, User.name, User.email, User.picture_url)
+
+
+def _assignment_fields(assignment: ZoneAssignment) -> dict:
+    """
+    Read the base AssignmentResponse fields off an assignment row
+
+    Columns left unloaded by load_only are skipped (they keep the schema default)
+    rather than lazy-loaded one row at a time.
+    """
+    unloaded = inspect(assignment).unloaded
+    return {field: getattr(assignment, field) for field in _ASSIGNMENT_FIELDS if field not in unloaded}
+
+
+def build_assignment_with_volunteer(assignment: ZoneAssignment, notes_count: int = 0) -> AssignmentWithVolunteer:
+    """
+    Build the organizer view of an assignment
+
+    Args:
+        assignment: Assignment with its volunteer loaded (or in the identity map)
+        notes_count: Number of notes on the assignment
+
+    Returns:
+        AssignmentWithVolunteer
+    """
+    volunteer = assignment.volunteer
+    return AssignmentWithVolunteer(
+        **_assignment_fields(assignment),
+        volunteer_name=volunteer.name if volunteer else "Unknown",
+        volunteer_email=volunteer.email if volunteer else "",
+        volunteer_picture_url=volunteer.picture_url if volunteer else None,
+        notes_count=notes_count
+    )
+
+
+def build_assignment_with_zone(
+    assignment: ZoneAssignment,
+    zone: Zone,
+    project: Project,
+    zone_geometry: dict,
+    notes_list: Optional[list] = None,
+    other_volunteers: Optional[List[AssignmentWithVolunteer]] = None
+) -> AssignmentWithZone:
+    """
+    Build the volunteer view of an assignment
+
+    Args:
+        assignment: Assignment row
+        zone: The assignment's zone
+        project: The zone's project
+        zone_geometry: Zone geometry as GeoJSON
+        notes_list: AssignmentNote rows (authors loaded), validated via from_attributes
+        other_volunteers: Other assignments on the same zone
+
+    Returns:
+        AssignmentWithZone
+    """
+    return AssignmentWithZone(
+        **_assignment_fields(assignment),
+        zone_name=zone.name,
+        zone_color=zone.color,
+        project_id=project.id,
+        project_name=project.name,
+        zone_geometry=zone_geometry,
+        notes_list=notes_list or [],
+        other_volunteers=other_volunteers or []
+    )
+
+
+def _with_zone_geometry(view: AssignmentWithZone, zone_geojson: str) -> dict:
+    """
+    Serialize a volunteer view for an ORJSONResponse, splicing in the zone geometry
+
+    The GeoJSON is already text, so it is embedded as an orjson.Fragment instead
+    of being parsed, validated and re-encoded.
+    """
+    content = view.model_dump(mode="json", exclude={"zone_geometry"})
+    content["zone_geometry"] = orjson.Fragment(zone_geojson)
+    return content
+
+
+def _build_updated_assignment(assignment: ZoneAssignment, db: Session) -> dict:
+    """
+    Build the volunteer view returned by the PATCH endpoints
+
+    Zone and project come from one joined query and geometry from the GeoJSON
+    cache; notes and other volunteers are left empty (populated on full get).
+    """
+    zone, project = db.query(Zone, Project)\
+        .options(defer(Zone.geometry))\
+        .join(Project, Project.id == Zone.project_id)\
+        .filter(Zone.id == assignment.zone_id)\
+        .one()
+    view = build_assignment_with_zone(assignment, zone, project, zone_geometry={})
+
+    return _with_zone_geometry(view, get_zone_geojson([zone.id], db)[zone.id])
 
 
 # Organizer Endpoints
 
 
 @router.get("/projects/{project_id}", response_model=List[AssignmentWithVolunteer])
-async def get_project_assignments(
+def get_project_assignments(
     project_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all assignments for a project"""
     # Check project access
-    check_project_access(project_id, current_user, db)
+    require_project_role(project_id, current_user, db)
 
-    # Get all assignments for zones in this project
-    assignments = db.query(ZoneAssignment)\
+    # Notes count per assignment as a correlated subquery, so one statement returns everything
+    notes_count = select(func.count(AssignmentNote.id))\
+        .where(AssignmentNote.assignment_id == ZoneAssignment.id)\
+        .correlate(ZoneAssignment)\
+        .scalar_subquery()
+
+    # Get all assignments for zones in this project, with volunteers in the same query
+    rows = db.query(ZoneAssignment, notes_count.label("notes_count"))\
+        .options(_ASSIGNMENT_LIST_COLUMNS, _VOLUNTEER_SUMMARY)\
         .join(Zone, Zone.id == ZoneAssignment.zone_id)\
         .filter(Zone.project_id == project_id)\
         .all()
 
-    # Enrich with volunteer details and notes count
-    result = []
-    for assignment in assignments:
-        volunteer = db.query(User).filter(User.id == assignment.volunteer_id).first()
-        notes_count = db.query(AssignmentNote).filter(AssignmentNote.assignment_id == assignment.id).count()
-        result.append({
-            "id": assignment.id,
-            "zone_id": assignment.zone_id,
-            "volunteer_id": assignment.volunteer_id,
-            "assigned_by": assignment.assigned_by,
-            "assigned_at": assignment.assigned_at,
-            "status": assignment.status,
-            "started_at": assignment.started_at,
-            "completed_at": assignment.completed_at,
-            "volunteer_name": volunteer.name if volunteer else "Unknown",
-            "volunteer_email": volunteer.email if volunteer else "",
-            "volunteer_picture_url": volunteer.picture_url if volunteer else None,
-            "manual_completion_percentage": assignment.manual_completion_percentage,
-            "notes": assignment.notes,
-            "notes_count": notes_count
-        })
-
-    return result
+    assignments = [build_assignment_with_volunteer(assignment, count) for assignment, count in rows]
+
+    return Response(ASSIGNMENT_WITH_VOLUNTEER_LIST.dump_json(assignments), media_type="application/json")
 
 
 @router.post("/projects/{project_id}", response_model=AssignmentWithVolunteer)
-async def create_assignment(
+def create_assignment(
     project_id: UUID,
     assignment_data: AssignmentCreate,
     db: Session = Depends(get_db),
@@ -149,7 +292,7 @@ async def create_assignment(
 ):
     """Create a new volunteer assignment"""
     # Check if user can assign volunteers (must be organizer or owner)
-    check_can_assign_volunteers(project_id, current_user, db)
+    require_project_role(project_id, current_user, db, CollaboratorRole.ORGANIZER)
 
     # Verify zone exists and belongs to this project
     zone = db.query(Zone).filter(Zone.id == assignment_data.zone_id).first()
@@ -173,21 +316,6 @@ async def create_assignment(
             detail="Volunteer not found"
         )
 
-    # Check for duplicate active assignment (same volunteer + zone)
-    existing = db.query(ZoneAssignment)\
-        .filter(
-            ZoneAssignment.zone_id == assignment_data.zone_id,
-            ZoneAssignment.volunteer_id == assignment_data.volunteer_id,
-            ZoneAssignment.status != 'completed'
-        )\
-        .first()
-
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="This volunteer is already assigned to this zone"
-        )
-
     # Create assignment
     assignment = ZoneAssignment(
         zone_id=assignment_data.zone_id,
@@ -196,29 +324,23 @@ async def create_assignment(
         status='assigned'
     )
 
+    # Duplicate active assignments (same volunteer + zone) are rejected by a partial unique index
     db.add(assignment)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        _raise_for_assignment_conflict(e)
     db.refresh(assignment)
 
     logger.info(f"Assignment created: volunteer {volunteer.name} assigned to zone {zone.name} by {current_user.name}")
 
-    return {
-        "id": assignment.id,
-        "zone_id": assignment.zone_id,
-        "volunteer_id": assignment.volunteer_id,
-        "assigned_by": assignment.assigned_by,
-        "assigned_at": assignment.assigned_at,
-        "status": assignment.status,
-        "started_at": assignment.started_at,
-        "completed_at": assignment.completed_at,
-        "volunteer_name": volunteer.name,
-        "volunteer_email": volunteer.email,
-        "volunteer_picture_url": volunteer.picture_url
-    }
+    # assignment.volunteer resolves from the identity map (volunteer was loaded above)
+    return build_assignment_with_volunteer(assignment)
 
 
 @router.get("/zones/{zone_id}", response_model=List[AssignmentWithVolunteer])
-async def get_zone_assignments(
+def get_zone_assignments(
     zone_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -232,36 +354,22 @@ async def get_zone_assignments(
             detail="Zone not found"
         )
 
-    check_project_access(zone.project_id, current_user, db)
+    require_project_role(zone.project_id, current_user, db)
 
-    # Get assignments
+    # Get assignments with their volunteers
     assignments = db.query(ZoneAssignment)\
+        .options(_ASSIGNMENT_LIST_COLUMNS, _VOLUNTEER_SUMMARY)\
         .filter(ZoneAssignment.zone_id == zone_id)\
         .all()
 
-    # Enrich with volunteer details
-    result = []
-    for assignment in assignments:
-        volunteer = db.query(User).filter(User.id == assignment.volunteer_id).first()
-        result.append({
-            "id": assignment.id,
-            "zone_id": assignment.zone_id,
-            "volunteer_id": assignment.volunteer_id,
-            "assigned_by": assignment.assigned_by,
-            "assigned_at": assignment.assigned_at,
-            "status": assignment.status,
-            "started_at": assignment.started_at,
-            "completed_at": assignment.completed_at,
-            "volunteer_name": volunteer.name if volunteer else "Unknown",
-            "volunteer_email": volunteer.email if volunteer else "",
-            "volunteer_picture_url": volunteer.picture_url if volunteer else None
-        })
-
-    return result
+    return Response(
+        ASSIGNMENT_WITH_VOLUNTEER_LIST.dump_json([build_assignment_with_volunteer(assignment) for assignment in assignments]),
+        media_type="application/json"
+    )
 
 
 @router.patch("/{assignment_id}", response_model=AssignmentResponse)
-async def update_assignment(
+def update_assignment(
     assignment_id: UUID,
     update_data: AssignmentUpdate,
     db: Session = Depends(get_db),
@@ -272,8 +380,7 @@ async def update_assignment(
     assignment = check_assignment_access(assignment_id, current_user, db)
 
     # Check if user can manage assignments (must be organizer or owner)
-    zone = db.query(Zone).filter(Zone.id == assignment.zone_id).first()
-    check_can_assign_volunteers(zone.project_id, current_user, db)
+    check_project_permissions(assignment.zone.project, current_user, db, CollaboratorRole.ORGANIZER)
 
     # Update fields
     if update_data.status is not None:
@@ -283,7 +390,12 @@ async def update_assignment(
     if update_data.completed_at is not None:
         assignment.completed_at = update_data.completed_at
 
-    db.commit()
+    # Reactivating a completed assignment can collide with another active one
+    try:
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        _raise_for_assignment_conflict(e)
     db.refresh(assignment)
 
     logger.info(f"Assignment {assignment_id} updated by {current_user.name}")
@@ -292,7 +404,7 @@ async def update_assignment(
 
 
 @router.delete("/{assignment_id}")
-async def delete_assignment(
+def delete_assignment(
     assignment_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -302,8 +414,7 @@ async def delete_assignment(
     assignment = check_assignment_access(assignment_id, current_user, db)
 
     # Check if user can manage assignments (must be organizer or owner)
-    zone = db.query(Zone).filter(Zone.id == assignment.zone_id).first()
-    check_can_assign_volunteers(zone.project_id, current_user, db)
+    check_project_permissions(assignment.zone.project, current_user, db, CollaboratorRole.ORGANIZER)
 
     db.delete(assignment)
     db.commit()
@@ -314,7 +425,7 @@ async def delete_assignment(
 
 
 @router.get("/projects/{project_id}/available-volunteers", response_model=List[VolunteerInfo])
-async def get_available_volunteers(
+def get_available_volunteers(
     project_id: UUID,
     zone_id: Optional[UUID] = None,
     db: Session = Depends(get_db),
@@ -324,64 +435,47 @@ async def get_available_volunteers(
     # Check if user can assign volunteers
     project = check_can_assign_volunteers(project_id, current_user, db)
 
-    # Get project owner
-    volunteers = []
-    owner = db.query(User).filter(User.id == project.owner_id).first()
-    if owner:
-        # Count current active assignments
-        count = db.query(ZoneAssignment)\
-            .join(Zone)\
-            .filter(
-                Zone.project_id == project_id,
-                ZoneAssignment.volunteer_id == owner.id,
-                ZoneAssignment.status.in_(['assigned', 'in_progress'])
-            )\
-            .count()
-
-        volunteers.append({
-            "id": owner.id,
-            "name": owner.name,
-            "email": owner.email,
-            "picture_url": owner.picture_url,
-            "current_assignments_count": count
-        })
+    # Active assignment counts per volunteer in this project
+    counts_sq = db.query(ZoneAssignment.volunteer_id, func.count(ZoneAssignment.id).label("active_count"))\
+        .join(Zone, Zone.id == ZoneAssignment.zone_id)\
+        .filter(
+            Zone.project_id == project_id,
+            ZoneAssignment.status.in_(['assigned', 'in_progress'])
+        )\
+        .group_by(ZoneAssignment.volunteer_id)\
+        .subquery()
 
-    # Get all collaborators
-    collaborators = db.query(ProjectCollaborator)\
-        .filter(ProjectCollaborator.project_id == project_id)\
-        .all()
+    collaborator_ids = select(ProjectCollaborator.user_id)\
+        .where(ProjectCollaborator.project_id == project_id)
+
+    # Owner plus all collaborators, each with their count, in a single query
+    query = db.query(User, func.coalesce(counts_sq.c.active_count, 0))\
+        .outerjoin(counts_sq, counts_sq.c.volunteer_id == User.id)\
+        .filter(or_(User.id == project.owner_id, User.id.in_(collaborator_ids)))
 
-    for collab in collaborators:
-        user = db.query(User).filter(User.id == collab.user_id).first()
-        if user and user.id != owner.id:  # Don't duplicate owner
-            # Count current active assignments
-            count = db.query(ZoneAssignment)\
-                .join(Zone)\
-                .filter(
-                    Zone.project_id == project_id,
-                    ZoneAssignment.volunteer_id == user.id,
-                    ZoneAssignment.status.in_(['assigned', 'in_progress'])
-                )\
-                .count()
-
-            volunteers.append({
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "picture_url": user.picture_url,
-                "current_assignments_count": count
-            })
-
-    # If zone_id is provided, filter out users already assigned to that zone
+    # If zone_id is provided, anti-join out users already actively assigned to that zone
     if zone_id:
-        existing_assignments = db.query(ZoneAssignment.volunteer_id)\
-            .filter(
+        query = query\
+            .outerjoin(ZoneAssignment, and_(
+                ZoneAssignment.volunteer_id == User.id,
                 ZoneAssignment.zone_id == zone_id,
                 ZoneAssignment.status != 'completed'
-            )\
-            .all()
-        assigned_ids = {a[0] for a in existing_assignments}
-        volunteers = [v for v in volunteers if v["id"] not in assigned_ids]
+            ))\
+            .filter(ZoneAssignment.id.is_(None))
+
+    # Owner is listed first, as before
+    rows = query.order_by(User.id != project.owner_id).all()
+
+    volunteers = [
+        {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "picture_url": user.picture_url,
+            "current_assignments_count": count
+        }
+        for user, count in rows
+    ]
 
     return volunteers
 
@@ -390,55 +484,39 @@ async def get_available_volunteers(
 
 
 @router.get("/my-assignments", response_model=List[AssignmentWithZone])
-async def get_my_assignments(
+def get_my_assignments(
     project_id: Optional[UUID] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all assignments for the current user"""
-    query = db.query(ZoneAssignment)\
-        .join(Zone)\
-        .join(Project)\
+    # Zone and project come back in the same row; geometry comes from the GeoJSON cache
+    query = db.query(ZoneAssignment, Zone, Project)\
+        .options(defer(Zone.geometry))\
+        .join(Zone, Zone.id == ZoneAssignment.zone_id)\
+        .join(Project, Project.id == Zone.project_id)\
         .filter(ZoneAssignment.volunteer_id == current_user.id)
 
     # Filter by project if specified
     if project_id:
         query = query.filter(Zone.project_id == project_id)
 
-    assignments = query.all()
-
-    # Enrich with zone and project details
-    result = []
-    for assignment in assignments:
-        zone = db.query(Zone).filter(Zone.id == assignment.zone_id).first()
-        project = db.query(Project).filter(Project.id == zone.project_id).first()
-
-        # Get geometry as GeoJSON
-        geometry_geojson = json.loads(db.scalar(zone.geometry.ST_AsGeoJSON()))
-
-        result.append({
-            "id": assignment.id,
-            "zone_id": assignment.zone_id,
-            "volunteer_id": assignment.volunteer_id,
-            "assigned_by": assignment.assigned_by,
-            "assigned_at": assignment.assigned_at,
-            "status": assignment.status,
-            "started_at": assignment.started_at,
-            "completed_at": assignment.completed_at,
-            "notes": assignment.notes,
-            "manual_completion_percentage": assignment.manual_completion_percentage,
-            "zone_name": zone.name,
-            "zone_color": zone.color,
-            "project_id": project.id,
-            "project_name": project.name,
-            "zone_geometry": geometry_geojson
-        })
-
-    return result
+    rows = query.all()
+    geojson_by_zone = get_zone_geojson((zone.id for _, zone, _ in rows), db)
+
+    content = [
+        _with_zone_geometry(
+            build_assignment_with_zone(assignment, zone, project, zone_geometry={}),
+            geojson_by_zone[zone.id]
+        )
+        for assignment, zone, project in rows
+    ]
+
+    return ORJSONResponse(content)
 
 
 @router.get("/my-assignments/{assignment_id}", response_model=AssignmentWithZone)
-async def get_my_assignment(
+def get_my_assignment(
     assignment_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -447,165 +525,104 @@ async def get_my_assignment(
     # Check that assignment belongs to current user
     assignment = check_assignment_access(assignment_id, current_user, db, require_volunteer=True)
 
-    # Get zone and project details
-    zone = db.query(Zone).filter(Zone.id == assignment.zone_id).first()
-    project = db.query(Project).filter(Project.id == zone.project_id).first()
+    # Zone and project were eager-loaded by check_assignment_access
+    zone = assignment.zone
+    project = zone.project
 
-    # Get geometry as GeoJSON
-    geometry_geojson = json.loads(db.scalar(zone.geometry.ST_AsGeoJSON()))
+    # Get geometry as GeoJSON text, spliced into the response unparsed
+    geometry_geojson = get_zone_geojson([zone.id], db)[zone.id]
 
     # Get other volunteers assigned to this zone
-    from app.models.zone import AssignmentNote
     other_assignments = db.query(ZoneAssignment)\
+        .options(_ASSIGNMENT_LIST_COLUMNS, _VOLUNTEER_SUMMARY)\
         .filter(
             ZoneAssignment.zone_id == assignment.zone_id,
             ZoneAssignment.id != assignment_id
         )\
         .all()
 
-    other_volunteers = []
-    for other_assign in other_assignments:
-        volunteer = db.query(User).filter(User.id == other_assign.volunteer_id).first()
-        other_volunteers.append({
-            "id": other_assign.id,
-            "zone_id": other_assign.zone_id,
-            "volunteer_id": other_assign.volunteer_id,
-            "assigned_by": other_assign.assigned_by,
-            "assigned_at": other_assign.assigned_at,
-            "status": other_assign.status,
-            "started_at": other_assign.started_at,
-            "completed_at": other_assign.completed_at,
-            "notes": other_assign.notes,
-            "manual_completion_percentage": other_assign.manual_completion_percentage,
-            "volunteer_name": volunteer.name if volunteer else "Unknown",
-            "volunteer_email": volunteer.email if volunteer else "",
-            "volunteer_picture_url": volunteer.picture_url if volunteer else None
-        })
+    other_volunteers = [build_assignment_with_volunteer(other_assign) for other_assign in other_assignments]
 
     # Get notes list
     notes = db.query(AssignmentNote)\
+        .options(joinedload(AssignmentNote.author))\
         .filter(AssignmentNote.assignment_id == assignment_id)\
         .order_by(AssignmentNote.created_at.desc())\
         .all()
 
-    notes_list = []
-    for note in notes:
-        author = db.query(User).filter(User.id == note.user_id).first()
-        notes_list.append({
-            "id": note.id,
-            "assignment_id": note.assignment_id,
-            "user_id": note.user_id,
-            "content": note.content,
-            "created_at": note.created_at,
-            "updated_at": note.updated_at,
-            "author_name": author.name if author else "Unknown",
-            "author_email": author.email if author else "",
-            "author_picture_url": author.picture_url if author else None
-        })
-
-    # Get assigned_by user name
-    assigned_by_user = db.query(User).filter(User.id == assignment.assigned_by).first()
-    assigned_by_name = assigned_by_user.name if assigned_by_user else "Unknown"
-
-    return {
-        "id": assignment.id,
-        "zone_id": assignment.zone_id,
-        "volunteer_id": assignment.volunteer_id,
-        "assigned_by": assignment.assigned_by,
-        "assigned_at": assignment.assigned_at,
-        "status": assignment.status,
-        "started_at": assignment.started_at,
-        "completed_at": assignment.completed_at,
-        "notes": assignment.notes,
-        "manual_completion_percentage": assignment.manual_completion_percentage,
-        "zone_name": zone.name,
-        "zone_color": zone.color,
-        "project_id": project.id,
-        "project_name": project.name,
-        "zone_geometry": geometry_geojson,
-        "notes_list": notes_list,
-        "other_volunteers": other_volunteers,
-        "assigned_by_name": assigned_by_name
-    }
+    # Author details are read from note.author by AssignmentNoteResponse
+    view = build_assignment_with_zone(
+        assignment, zone, project, zone_geometry={},
+        notes_list=notes,
+        other_volunteers=other_volunteers
+    )
+
+    return ORJSONResponse(_with_zone_geometry(view, geometry_geojson))
 
 
 @router.patch("/my-assignments/{assignment_id}/status", response_model=AssignmentWithZone)
-async def update_my_assignment_status(
+def update_my_assignment_status(
     assignment_id: UUID,
     status_update: VolunteerStatusUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Update assignment status (volunteer can only update their own)"""
-    # Check that assignment belongs to current user
-    assignment = check_assignment_access(assignment_id, current_user, db, require_volunteer=True)
-
-    # Validate status transition
-    old_status = assignment.status
-    allowed_transitions = {
-        'assigned': ['in_progress'],
-        'in_progress': ['assigned', 'completed'],
-        'completed': ['in_progress']  # Allow reactivating completed zones
-    }
+    new_status = status_update.status
+    previous_statuses = [old for old, targets in ALLOWED_STATUS_TRANSITIONS.items() if new_status in targets]
+
+    # Auto-set timestamps; SET expressions see the row's pre-update values
+    values = {"status": new_status}
+    if new_status == 'in_progress':
+        # Reactivating a completed zone clears completed_at; started_at is set the first time only
+        values["completed_at"] = case((ZoneAssignment.status == 'completed', None), else_=ZoneAssignment.completed_at)
+        values["started_at"] = func.coalesce(ZoneAssignment.started_at, func.now())
+    elif new_status == 'completed':
+        values["completed_at"] = func.coalesce(ZoneAssignment.completed_at, func.now())
+    elif new_status == 'assigned':
+        # Reset when going back to assigned
+        values["started_at"] = None
+
+    # Ownership and the transition rule are checked by the WHERE clause, so the
+    # read-validate-write happens atomically in one round trip
+    try:
+        assignment = db.scalars(
+            update(ZoneAssignment)
+            .where(
+                ZoneAssignment.id == assignment_id,
+                ZoneAssignment.volunteer_id == current_user.id,
+                ZoneAssignment.status.in_(previous_statuses)
+            )
+            .values(**values)
+            .returning(ZoneAssignment)
+        ).first()
+    except IntegrityError as e:
+        # Reactivating a completed assignment while another one on the zone is active
+        db.rollback()
+        _raise_for_assignment_conflict(e)
 
-    if status_update.status not in allowed_transitions.get(old_status, []):
+    if not assignment:
+        # Raises 404/403 if the assignment is missing or not ours, otherwise the transition was invalid
+        old_status = check_assignment_access(assignment_id, current_user, db, require_volunteer=True).status
+        allowed = ALLOWED_STATUS_TRANSITIONS.get(old_status, [])
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid status transition from {old_status} to {status_update.status}. "
-                   f"Allowed transitions: {', '.join(allowed_transitions.get(old_status, []))}"
+            detail=f"Invalid status transition from {old_status} to {new_status}. "
+                   f"Allowed transitions: {', '.join(allowed)}"
         )
 
-    # Update status
-    assignment.status = status_update.status
-
-    # Auto-set timestamps
-    if status_update.status == 'in_progress':
-        if old_status == 'completed':
-            # Reactivating a completed zone - clear completed_at
-            assignment.completed_at = None
-        if not assignment.started_at:
-            # First time starting
-            assignment.started_at = datetime.utcnow()
-    elif status_update.status == 'completed' and not assignment.completed_at:
-        assignment.completed_at = datetime.utcnow()
-    elif status_update.status == 'assigned' and old_status == 'in_progress':
-        # Reset when going back to assigned
-        assignment.started_at = None
+    # Return with empty lists for notes and other volunteers (can be populated on full get)
+    response = _build_updated_assignment(assignment, db)
 
     db.commit()
-    db.refresh(assignment)
-
-    logger.info(f"Assignment {assignment_id} status updated from {old_status} to {status_update.status} by volunteer {current_user.name}")
 
-    # Get zone and project details for response
-    zone = db.query(Zone).filter(Zone.id == assignment.zone_id).first()
-    project = db.query(Project).filter(Project.id == zone.project_id).first()
-    geometry_geojson = json.loads(db.scalar(zone.geometry.ST_AsGeoJSON()))
+    logger.info(f"Assignment {assignment_id} status updated to {new_status} by volunteer {current_user.name}")
 
-    # Return with empty lists for notes and other volunteers (can be populated on full get)
-    return {
-        "id": assignment.id,
-        "zone_id": assignment.zone_id,
-        "volunteer_id": assignment.volunteer_id,
-        "assigned_by": assignment.assigned_by,
-        "assigned_at": assignment.assigned_at,
-        "status": assignment.status,
-        "started_at": assignment.started_at,
-        "completed_at": assignment.completed_at,
-        "notes": assignment.notes,
-        "manual_completion_percentage": assignment.manual_completion_percentage,
-        "zone_name": zone.name,
-        "zone_color": zone.color,
-        "project_id": project.id,
-        "project_name": project.name,
-        "zone_geometry": geometry_geojson,
-        "notes_list": [],
-        "other_volunteers": []
-    }
+    return ORJSONResponse(response)
 
 
 @router.patch("/my-assignments/{assignment_id}", response_model=AssignmentWithZone)
-async def update_my_assignment(
+def update_my_assignment(
     assignment_id: UUID,
     update_data: VolunteerAssignmentUpdate,
     db: Session = Depends(get_db),
@@ -628,25 +645,4 @@ async def update_my_assignment(
 
     logger.info(f"Assignment {assignment_id} updated by volunteer {current_user.name}")
 
-    # Get zone and project details for response
-    zone = db.query(Zone).filter(Zone.id == assignment.zone_id).first()
-    project = db.query(Project).filter(Project.id == zone.project_id).first()
-    geometry_geojson = json.loads(db.scalar(zone.geometry.ST_AsGeoJSON()))
-
-    return {
-        "id": assignment.id,
-        "zone_id": assignment.zone_id,
-        "volunteer_id": assignment.volunteer_id,
-        "assigned_by": assignment.assigned_by,
-        "assigned_at": assignment.assigned_at,
-        "status": assignment.status,
-        "started_at": assignment.started_at,
-        "completed_at": assignment.completed_at,
-        "notes": assignment.notes,
-        "manual_completion_percentage": assignment.manual_completion_percentage,
-        "zone_name": zone.name,
-        "zone_color": zone.color,
-        "project_id": project.id,
-        "project_name": project.name,
-        "zone_geometry": geometry_geojson
-    }
+    return ORJSONResponse(_build_updated_assignment(assignment, db))
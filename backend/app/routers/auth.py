@@ -1,8 +1,11 @@
 """Authentication router"""
 from fastapi import APIRouter, Depends, HTTPException, status, Response, Cookie
-from fastapi.responses import RedirectResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import RedirectResponse, ORJSONResponse
+from sqlalchemy import func, insert, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from app.database import get_db
@@ -14,20 +17,40 @@ from app.utils.security import (
     create_refresh_token,
     verify_token,
     hash_password,
-    verify_password
+    verify_and_update_password
 )
 from app.dependencies import get_current_user
+from app.utils.auth_cache import invalidate_cached_user, load_user, remember_user_email
+from app.utils.shared_cache import cache_pop, cache_set_once
 from uuid import UUID
 
 router = APIRouter()
 
-# In-memory store for OAuth state (in production, use Redis)
-# Format: {state: timestamp}
-oauth_states = {}
+# Pending OAuth states live in the shared cache so the callback can land on any worker
+OAUTH_STATE_TTL = 600  # Seconds a login attempt has to complete
+
+# Password logins within this many seconds of the last one skip the last_login write
+LAST_LOGIN_UPDATE_INTERVAL = 3600
+
+
+# User columns returned by INSERT/UPDATE ... RETURNING, so responses need no refresh query
+_USER_RESPONSE_COLUMNS = (
+    User.id,
+    User.email,
+    User.name,
+    User.picture_url,
+    User.created_at,
+    User.last_login
+)
+
+
+def _oauth_state_key(state: str) -> str:
+    """Shared cache key for a pending OAuth state"""
+    return f"oauth_state:{state}"
 
 
 @router.post("/auth/register", response_model=TokenResponse, status_code=status.HTTP_201_CREATED)
-async def register(
+def register(
     user_data: UserRegistration,
     db: Session = Depends(get_db)
 ):
@@ -42,42 +65,44 @@ async def register(
         JWT tokens and user info
     """
     # Check if user already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = db.query(User).filter(func.lower(User.email) == user_data.email.lower()).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    # Create new user
-    user = User(
-        email=user_data.email,
-        name=user_data.name,
-        password_hash=hash_password(user_data.password),
-        last_login=datetime.utcnow()
-    )
-
-    db.add(user)
+    # Create new user; RETURNING hands back the server-generated id and timestamps
+    user = db.execute(
+        insert(User)
+        .values(
+            email=user_data.email,
+            name=user_data.name,
+            password_hash=hash_password(user_data.password),
+            last_login=datetime.utcnow()
+        )
+        .returning(*_USER_RESPONSE_COLUMNS)
+    ).one()
     db.commit()
-    db.refresh(user)
+    remember_user_email(user.email, user.id)
 
     # Generate JWT tokens
     access_token = create_access_token(user.id)
     refresh_token = create_refresh_token(user.id)
 
     # Create response with refresh token in httpOnly cookie
-    response = JSONResponse(
+    response = ORJSONResponse(
         status_code=status.HTTP_201_CREATED,
         content={
             "access_token": access_token,
             "token_type": "bearer",
             "user": {
-                "id": str(user.id),
+                "id": user.id,
                 "email": user.email,
                 "name": user.name,
                 "picture_url": user.picture_url,
-                "created_at": user.created_at.isoformat(),
-                "last_login": user.last_login.isoformat() if user.last_login else None
+                "created_at": user.created_at,
+                "last_login": user.last_login
             }
         }
     )
@@ -96,7 +121,7 @@ async def register(
 
 
 @router.post("/auth/login", response_model=TokenResponse)
-async def login(
+def login(
     credentials: UserLogin,
     db: Session = Depends(get_db)
 ):
@@ -111,41 +136,61 @@ async def login(
         JWT tokens and user info
     """
     # Find user by email
-    user = db.query(User).filter(User.email == credentials.email).first()
+    account = db.query(*_USER_RESPONSE_COLUMNS, User.password_hash).filter(func.lower(User.email) == credentials.email.lower()).first()
 
-    if not user or not user.password_hash:
+    if not account or not account.password_hash:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
 
     # Verify password
-    if not verify_password(credentials.password, user.password_hash):
+    valid, new_hash = verify_and_update_password(credentials.password, account.password_hash)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
 
-    # Update last login
-    user.last_login = datetime.utcnow()
-    db.commit()
-    db.refresh(user)
+    # Update last login at most once per LAST_LOGIN_UPDATE_INTERVAL, transparently
+    # upgrading legacy bcrypt hashes in the same statement
+    now = datetime.now(timezone.utc)
+    login_is_recent = account.last_login is not None and \
+        now - account.last_login < timedelta(seconds=LAST_LOGIN_UPDATE_INTERVAL)
+
+    if login_is_recent and not new_hash:
+        user = account
+    else:
+        values = {"last_login": now}
+        if new_hash:
+            values["password_hash"] = new_hash
+
+        user = db.execute(
+            update(User)
+            .where(User.id == account.id)
+            .values(**values)
+            .returning(*_USER_RESPONSE_COLUMNS)
+        ).one()
+        db.commit()
+        invalidate_cached_user(user.id)
+
+    remember_user_email(user.email, user.id)
 
     # Generate JWT tokens
     access_token = create_access_token(user.id)
     refresh_token = create_refresh_token(user.id)
 
     # Create response with refresh token in httpOnly cookie
-    response = JSONResponse(content={
+    response = ORJSONResponse(content={
         "access_token": access_token,
         "token_type": "bearer",
         "user": {
-            "id": str(user.id),
+            "id": user.id,
             "email": user.email,
             "name": user.name,
             "picture_url": user.picture_url,
-            "created_at": user.created_at.isoformat(),
-            "last_login": user.last_login.isoformat() if user.last_login else None
+            "created_at": user.created_at,
+            "last_login": user.last_login
         }
     })
 
@@ -163,7 +208,7 @@ async def login(
 
 
 @router.get("/auth/google/login")
-async def google_login():
+def google_login():
     """
     Initiate Google OAuth login
 
@@ -172,15 +217,49 @@ async def google_login():
     auth_url, state = google_oauth_service.generate_auth_url()
 
     # Store state for CSRF verification (expires in 10 minutes)
-    oauth_states[state] = datetime.utcnow()
-
-    # Clean up old states (older than 10 minutes)
-    cutoff = datetime.utcnow().timestamp() - 600
-    oauth_states.clear()  # Simple cleanup for now
+    cache_set_once(_oauth_state_key(state), "1", OAUTH_STATE_TTL)
 
     return {"authorization_url": auth_url, "state": state}
 
 
+def _upsert_google_user(user_info: dict, db: Session):
+    """
+    Create or update the user for a Google account (blocking DB work)
+
+    A single INSERT ... ON CONFLICT (google_id) DO UPDATE ... RETURNING
+    replaces the lookup, write and refresh round trips.
+
+    Args:
+        user_info: Profile returned by google_oauth_service.get_user_info
+        db: Database session
+
+    Returns:
+        Row with the user's response columns
+    """
+    stmt = pg_insert(User).values(
+        google_id=user_info["google_id"],
+        email=user_info["email"],
+        name=user_info["name"],
+        picture_url=user_info["picture_url"],
+        last_login=datetime.utcnow()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.google_id],
+        set_={
+            "name": stmt.excluded.name,
+            "picture_url": stmt.excluded.picture_url,
+            "last_login": stmt.excluded.last_login
+        }
+    )
+
+    user = db.execute(stmt.returning(*_USER_RESPONSE_COLUMNS)).one()
+    db.commit()
+    invalidate_cached_user(user.id)
+    remember_user_email(user.email, user.id)
+
+    return user
+
+
 @router.get("/auth/google/callback")
 async def google_callback(
     code: str,
@@ -198,27 +277,28 @@ async def google_callback(
     Returns:
         JWT tokens and user info
     """
-    # Verify state (CSRF protection)
-    if state not in oauth_states:
+    # Verify and consume state (CSRF protection); each state is accepted once
+    # The shared cache client is blocking, so it runs off the event loop
+    if await run_in_threadpool(cache_pop, _oauth_state_key(state)) is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid state parameter"
         )
 
-    # Remove used state
-    del oauth_states[state]
-
-    # Exchange code for access token
-    google_access_token = await google_oauth_service.exchange_code_for_token(code)
+    # Exchange code for access and ID tokens
+    token_data = await google_oauth_service.exchange_code_for_token(code)
 
-    if not google_access_token:
+    if not token_data:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to exchange code for token"
         )
 
-    # Get user info from Google
-    user_info = await google_oauth_service.get_user_info(google_access_token)
+    # The ID token already carries the profile claims, which saves the userinfo
+    # round trip; fall back to the userinfo endpoint if it's missing or unusable
+    user_info = google_oauth_service.decode_id_token(token_data["id_token"]) if token_data.get("id_token") else None
+    if not user_info:
+        user_info = await google_oauth_service.get_user_info(token_data["access_token"])
 
     if not user_info:
         raise HTTPException(
@@ -226,40 +306,20 @@ async def google_callback(
             detail="Failed to fetch user info from Google"
         )
 
-    # Check if user exists
-    user = db.query(User).filter(User.google_id == user_info["google_id"]).first()
-
-    if user:
-        # Update existing user
-        user.name = user_info["name"]
-        user.picture_url = user_info["picture_url"]
-        user.last_login = datetime.utcnow()
-        db.commit()
-        db.refresh(user)
-    else:
-        # Create new user
-        user = User(
-            google_id=user_info["google_id"],
-            email=user_info["email"],
-            name=user_info["name"],
-            picture_url=user_info["picture_url"],
-            last_login=datetime.utcnow()
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
+    # The Google calls above are awaited; the blocking DB work runs in the threadpool
+    user = await run_in_threadpool(_upsert_google_user, user_info, db)
 
     # Generate JWT tokens
     access_token = create_access_token(user.id)
     refresh_token = create_refresh_token(user.id)
 
     # Create response with refresh token in httpOnly cookie
-    response = JSONResponse(content={
+    response = ORJSONResponse(content={
         "access_token": access_token,
         "token_type": "bearer",
         "expires_in": 900,  # 15 minutes in seconds
         "user": {
-            "id": str(user.id),
+            "id": user.id,
             "email": user.email,
             "name": user.name,
             "picture_url": user.picture_url
@@ -280,7 +340,7 @@ async def google_callback(
 
 
 @router.post("/auth/refresh")
-async def refresh_access_token(
+def refresh_access_token(
     refresh_token: Optional[str] = Cookie(None),
     db: Session = Depends(get_db)
 ):
@@ -325,8 +385,8 @@ async def refresh_access_token(
             detail="Invalid user ID"
         )
 
-    # Verify user exists
-    user = db.query(User).filter(User.id == user_id).first()
+    # Verify user exists (served from the user cache when warm)
+    user = load_user(user_id, db)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -344,13 +404,21 @@ async def refresh_access_token(
 
 
 @router.post("/auth/logout")
-async def logout(response: Response):
+async def logout(response: Response, refresh_token: Optional[str] = Cookie(None)):
     """
     Logout user by clearing refresh token cookie
 
     Args:
         response: FastAPI response object
+        refresh_token: Refresh token from cookie, used to drop the cached user
     """
+    payload = verify_token(refresh_token, token_type="refresh") if refresh_token else None
+    if payload:
+        try:
+            invalidate_cached_user(UUID(payload["sub"]))
+        except (KeyError, ValueError, TypeError):
+            pass
+
     response.delete_cookie(key="refresh_token")
     return {"message": "Logged out successfully"}
 
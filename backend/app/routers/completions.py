@@ -1,15 +1,19 @@
 """Completion tracking routes"""
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 from typing import List
 from uuid import UUID
-from geoalchemy2.shape import from_shape, to_shape
-from shapely.geometry import shape, mapping
+from geoalchemy2.shape import from_shape
+from shapely.geometry import shape
 import json
+import orjson
 
 from app.database import get_db
-from app.models import ZoneAssignment, CompletionArea
+from app.models import Zone, ZoneAssignment, CompletionArea
 from app.schemas.completion import CompletionAreaCreate, CompletionAreaResponse
 from app.routers.auth import get_current_user
 from app.models.user import User
@@ -17,29 +21,98 @@ from app.models.user import User
 router = APIRouter(prefix="/completions", tags=["completions"])
 logger = logging.getLogger(__name__)
 
+# Response columns, with geometry serialized to GeoJSON by PostGIS in the same statement
+_AREA_RESPONSE_COLUMNS = (
+    CompletionArea.id,
+    CompletionArea.assignment_id,
+    func.ST_AsGeoJSON(CompletionArea.geometry),
+    CompletionArea.completed_at,
+    CompletionArea.notes
+)
 
-@router.post("/assignments/{assignment_id}/areas", response_model=CompletionAreaResponse)
-async def create_completion_area(
-    assignment_id: UUID,
-    area_data: CompletionAreaCreate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """Mark an area as completed within an assignment"""
-    # Verify assignment exists and belongs to current user
-    assignment = db.query(ZoneAssignment).filter(ZoneAssignment.id == assignment_id).first()
-    if not assignment:
+
+def _area_response(row) -> dict:
+    """
+    Convert an (id, assignment_id, geojson, completed_at, notes) row to a response dict
+
+    The GeoJSON from PostGIS is already text, so it is embedded as an orjson.Fragment
+    and the handlers return an ORJSONResponse instead of parsing and re-encoding it.
+    """
+    area_id, assignment_id, geometry_json, completed_at, notes = row
+    return {
+        "id": area_id,
+        "assignment_id": assignment_id,
+        "geometry": orjson.Fragment(geometry_json),
+        "completed_at": completed_at,
+        "notes": notes
+    }
+
+
+def _verify_assignment_owner(assignment_id: UUID, user: User, db: Session, detail: str, lock: bool = False) -> None:
+    """
+    Ensure an assignment exists and belongs to the user
+
+    Args:
+        assignment_id: Assignment ID
+        user: Current user
+        db: Database session
+        detail: 403 message when the assignment belongs to someone else
+        lock: Lock the assignment row (FOR UPDATE) before changing its completion areas
+
+    Raises:
+        HTTPException: 404 if the assignment doesn't exist, 403 if it isn't the user's
+    """
+    query = db.query(ZoneAssignment.volunteer_id).filter(ZoneAssignment.id == assignment_id)
+    if lock:
+        query = query.with_for_update()
+    volunteer_id = query.scalar()
+    if volunteer_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assignment not found"
         )
 
-    if assignment.volunteer_id != current_user.id:
+    if volunteer_id != user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only mark completion for your own assignments"
+            detail=detail
         )
 
+
+def _refresh_completed_area(assignment_id: UUID, db: Session) -> None:
+    """
+    Recompute an assignment's stored completed area from its completion areas
+
+    Callers must hold the assignment row lock (taken by _verify_assignment_owner
+    or the delete) so concurrent writers can't store a stale union.
+
+    Args:
+        assignment_id: Assignment ID
+        db: Database session
+    """
+    completed_area = select(func.ST_Area(func.ST_UnaryUnion(func.ST_Collect(CompletionArea.geometry))))\
+        .where(CompletionArea.assignment_id == assignment_id)\
+        .scalar_subquery()
+
+    db.execute(
+        update(ZoneAssignment)
+        .where(ZoneAssignment.id == assignment_id)
+        .values(completed_area_sqm=func.coalesce(completed_area, 0))
+        .execution_options(synchronize_session=False)
+    )
+
+
+@router.post("/assignments/{assignment_id}/areas", response_model=CompletionAreaResponse)
+def create_completion_area(
+    assignment_id: UUID,
+    area_data: CompletionAreaCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Mark an area as completed within an assignment"""
+    # Verify assignment exists and belongs to current user
+    _verify_assignment_owner(assignment_id, current_user, db, "You can only mark completion for your own assignments", lock=True)
+
     # Convert GeoJSON to PostGIS geometry
     try:
         geom_shape = shape(area_data.geometry)
@@ -51,98 +124,130 @@ async def create_completion_area(
             detail=f"Invalid geometry: {str(e)}"
         )
 
-    # Create completion area
-    completion_area = CompletionArea(
-        assignment_id=assignment_id,
-        geometry=geom_wkb,
-        notes=area_data.notes
-    )
-
-    db.add(completion_area)
+    # Create completion area; RETURNING hands back the GeoJSON without a second query
+    row = db.execute(
+        insert(CompletionArea)
+        .values(assignment_id=assignment_id, geometry=geom_wkb, notes=area_data.notes)
+        .returning(*_AREA_RESPONSE_COLUMNS)
+    ).one()
+    _refresh_completed_area(assignment_id, db)
     db.commit()
-    db.refresh(completion_area)
 
     logger.info(f"Completion area created for assignment {assignment_id} by {current_user.name}")
 
-    # Convert geometry back to GeoJSON for response
-    geometry_geojson = json.loads(db.scalar(completion_area.geometry.ST_AsGeoJSON()))
-
-    return {
-        "id": completion_area.id,
-        "assignment_id": completion_area.assignment_id,
-        "geometry": geometry_geojson,
-        "completed_at": completion_area.completed_at,
-        "notes": completion_area.notes
-    }
+    return ORJSONResponse(_area_response(row))
 
 
-@router.get("/assignments/{assignment_id}/areas", response_model=List[CompletionAreaResponse])
-async def get_completion_areas(
+@router.post("/assignments/{assignment_id}/areas/batch", response_model=List[CompletionAreaResponse])
+def create_completion_areas_batch(
     assignment_id: UUID,
+    areas_data: List[CompletionAreaCreate],
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all completion areas for an assignment"""
-    # Verify assignment exists and user has access
-    assignment = db.query(ZoneAssignment).filter(ZoneAssignment.id == assignment_id).first()
-    if not assignment:
+    """Mark several areas as completed in one request (e.g. syncing offline markings)"""
+    # Verify assignment exists and belongs to current user
+    _verify_assignment_owner(assignment_id, current_user, db, "You can only mark completion for your own assignments", lock=True)
+
+    if not areas_data:
+        return []
+
+    # Single multi-row INSERT; PostGIS parses the GeoJSON server-side
+    rows = [
+        {
+            "assignment_id": assignment_id,
+            "geometry": func.ST_SetSRID(func.ST_GeomFromGeoJSON(json.dumps(area.geometry)), 4326),
+            "notes": area.notes
+        }
+        for area in areas_data
+    ]
+
+    try:
+        inserted = db.execute(
+            insert(CompletionArea)
+            .values(rows)
+            .returning(*_AREA_RESPONSE_COLUMNS)
+        ).all()
+        _refresh_completed_area(assignment_id, db)
+        db.commit()
+    except DBAPIError as e:
+        db.rollback()
+        logger.error(f"Invalid geometry in batch: {e}")
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Assignment not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid geometry in batch"
         )
 
+    logger.info(f"{len(inserted)} completion areas created for assignment {assignment_id} by {current_user.name}")
+
+    return ORJSONResponse([_area_response(row) for row in inserted])
+
+
+@router.get("/assignments/{assignment_id}/areas", response_model=List[CompletionAreaResponse])
+def get_completion_areas(
+    assignment_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get all completion areas for an assignment"""
+    # Get all completion areas with their GeoJSON, joined to the assignment for the access check.
     # User must be the volunteer assigned to this zone
     # (or potentially an organizer - we could add that check later)
-    if assignment.volunteer_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You can only view completion for your own assignments"
-        )
+    rows = db.query(*_AREA_RESPONSE_COLUMNS)\
+        .join(ZoneAssignment, ZoneAssignment.id == CompletionArea.assignment_id)\
+        .filter(
+            CompletionArea.assignment_id == assignment_id,
+            ZoneAssignment.volunteer_id == current_user.id
+        )\
+        .all()
 
-    # Get all completion areas
-    areas = db.query(CompletionArea).filter(
-        CompletionArea.assignment_id == assignment_id
-    ).all()
-
-    # Convert to response format with GeoJSON
-    result = []
-    for area in areas:
-        geometry_geojson = json.loads(db.scalar(area.geometry.ST_AsGeoJSON()))
-        result.append({
-            "id": area.id,
-            "assignment_id": area.assignment_id,
-            "geometry": geometry_geojson,
-            "completed_at": area.completed_at,
-            "notes": area.notes
-        })
+    # No rows: either nothing is marked yet, or the assignment is missing / someone else's
+    if not rows:
+        _verify_assignment_owner(assignment_id, current_user, db, "You can only view completion for your own assignments")
 
-    return result
+    return ORJSONResponse([_area_response(row) for row in rows])
 
 
 @router.delete("/areas/{area_id}")
-async def delete_completion_area(
+def delete_completion_area(
     area_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Delete a completion area (undo marking)"""
-    # Get the area
-    area = db.query(CompletionArea).filter(CompletionArea.id == area_id).first()
-    if not area:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Completion area not found"
+    # Delete only if the area belongs to one of the user's assignments; the sub-select
+    # locks that assignment row so the completed area can be recomputed safely
+    owned_assignment = select(ZoneAssignment.id)\
+        .where(
+            ZoneAssignment.id == select(CompletionArea.assignment_id).where(CompletionArea.id == area_id).scalar_subquery(),
+            ZoneAssignment.volunteer_id == current_user.id
+        )\
+        .with_for_update()
+
+    deleted = db.execute(
+        delete(CompletionArea)
+        .where(
+            CompletionArea.id == area_id,
+            CompletionArea.assignment_id.in_(owned_assignment)
         )
-
-    # Verify user owns this assignment
-    assignment = db.query(ZoneAssignment).filter(ZoneAssignment.id == area.assignment_id).first()
-    if assignment.volunteer_id != current_user.id:
+        .returning(CompletionArea.assignment_id)
+        .execution_options(synchronize_session=False)
+    ).first()
+
+    if not deleted:
+        # Nothing deleted: tell a missing area apart from someone else's
+        exists = db.query(CompletionArea.id).filter(CompletionArea.id == area_id).first()
+        if not exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Completion area not found"
+            )
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only delete your own completion markings"
         )
 
-    db.delete(area)
+    _refresh_completed_area(deleted.assignment_id, db)
     db.commit()
 
     logger.info(f"Completion area {area_id} deleted by {current_user.name}")
@@ -151,39 +256,42 @@ async def delete_completion_area(
 
 
 @router.get("/assignments/{assignment_id}/progress")
-async def get_completion_progress(
+def get_completion_progress(
     assignment_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Calculate completion progress as percentage of zone area covered"""
-    # Verify assignment exists and user has access
-    assignment = db.query(ZoneAssignment).filter(ZoneAssignment.id == assignment_id).first()
-    if not assignment:
+    # Access check, zone area, stored completed area, percentage and count in one single-row lookup.
+    # completed_area_sqm is kept up to date on every completion area insert/delete.
+    total_area_expr = func.ST_Area(Zone.geometry)
+    completion_count = select(func.count(CompletionArea.id))\
+        .where(CompletionArea.assignment_id == ZoneAssignment.id)\
+        .scalar_subquery()
+    row = db.query(
+            ZoneAssignment.volunteer_id,
+            total_area_expr.label("total_area"),
+            ZoneAssignment.completed_area_sqm.label("completed_area"),
+            func.least(100.0, 100.0 * ZoneAssignment.completed_area_sqm / func.nullif(total_area_expr, 0)).label("progress_percentage"),
+            completion_count.label("completion_count")
+        )\
+        .join(Zone, Zone.id == ZoneAssignment.zone_id)\
+        .filter(ZoneAssignment.id == assignment_id)\
+        .first()
+
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Assignment not found"
         )
 
-    if assignment.volunteer_id != current_user.id:
+    if row.volunteer_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="You can only view progress for your own assignments"
         )
 
-    # Get the zone to calculate total area
-    from app.models import Zone
-    zone = db.query(Zone).filter(Zone.id == assignment.zone_id).first()
-    if not zone:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Zone not found"
-        )
-
-    # Calculate total zone area (in square meters)
-    # ST_Area with geography=true gives area in square meters
-    total_area = db.scalar(zone.geometry.ST_Area())
-
+    total_area = float(row.total_area or 0)
     if total_area == 0:
         return {
             "assignment_id": assignment_id,
@@ -193,39 +301,13 @@ async def get_completion_progress(
             "completion_count": 0
         }
 
-    # Get all completion areas and calculate their total coverage
-    # Use ST_Union to merge overlapping areas, then calculate area
-    areas = db.query(CompletionArea).filter(
-        CompletionArea.assignment_id == assignment_id
-    ).all()
-
-    if not areas:
-        return {
-            "assignment_id": assignment_id,
-            "total_area_sqm": float(total_area),
-            "completed_area_sqm": 0,
-            "progress_percentage": 0,
-            "completion_count": 0
-        }
-
-    # Union all completion geometries to handle overlaps
-    # This SQL query unions all the geometries and calculates the total area
-    from sqlalchemy import func, text
-    union_query = db.query(
-        func.ST_Area(
-            func.ST_Union(CompletionArea.geometry)
-        )
-    ).filter(
-        CompletionArea.assignment_id == assignment_id
-    ).scalar()
-
-    completed_area = float(union_query) if union_query else 0
-    progress_percentage = min(100, (completed_area / total_area) * 100) if total_area > 0 else 0
+    completed_area = float(row.completed_area) if row.completed_area else 0
+    progress_percentage = float(row.progress_percentage) if row.progress_percentage else 0
 
     return {
         "assignment_id": assignment_id,
-        "total_area_sqm": float(total_area),
+        "total_area_sqm": total_area,
         "completed_area_sqm": completed_area,
         "progress_percentage": round(progress_percentage, 2),
-        "completion_count": len(areas)
+        "completion_count": row.completion_count
     }
@@ -1,10 +1,13 @@
 """Health check endpoints for monitoring and container orchestration"""
 import logging
+import threading
+import time
 from datetime import datetime
 from fastapi import APIRouter, Depends, status, Request
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import text
 from sqlalchemy.orm import Session
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from app.database import get_db
 from app.config import settings
@@ -12,6 +15,79 @@ from app.config import settings
 router = APIRouter(tags=["health"])
 logger = logging.getLogger(__name__)
 
+# Table totals and the assignment status breakdown in a single round trip
+_RECORD_COUNTS_SQL = text("""
+    SELECT
+        (SELECT COUNT(*) FROM users) AS users,
+        (SELECT COUNT(*) FROM projects) AS projects,
+        (SELECT COUNT(*) FROM zones) AS zones,
+        COUNT(*) AS assignments,
+        COUNT(*) FILTER (WHERE status = 'assigned') AS assigned,
+        COUNT(*) FILTER (WHERE status = 'in_progress') AS in_progress,
+        COUNT(*) FILTER (WHERE status = 'completed') AS completed
+    FROM zone_assignments
+""")
+
+
+# Server and extension versions don't change while we're running; fetched once on first use
+_VERSIONS_SQL = text("""
+    SELECT
+        version() AS db_version,
+        PostGIS_version() AS postgis_version,
+        (SELECT extversion FROM pg_extension WHERE extname = 'vector') AS pgvector_version
+""")
+_cached_versions: Optional[Dict[str, Optional[str]]] = None
+
+
+def _get_versions(db: Session) -> Dict[str, Optional[str]]:
+    """
+    Get the PostgreSQL, PostGIS and pgvector versions, querying only the first time
+
+    Args:
+        db: Database session
+
+    Returns:
+        Dict with db_version, postgis_version and pgvector_version (None if not installed)
+    """
+    global _cached_versions
+    if _cached_versions is None:
+        _cached_versions = dict(db.execute(_VERSIONS_SQL).mappings().one())
+    return _cached_versions
+
+
+# Tables the startup probe requires; to_regclass returns NULL for missing ones
+_STARTUP_TABLES = ["users", "projects", "zones", "zone_assignments"]
+_STARTUP_TABLES_SQL = text("SELECT COUNT(to_regclass(name)) FROM unnest(CAST(:names AS text[])) AS name")
+_startup_complete = False
+
+# Last counts and when they were fetched; the lock lets one scrape refresh while others wait
+_counts_cache: Dict[str, Any] = {"ts": 0.0, "counts": None}
+_counts_lock = threading.Lock()
+
+
+def _get_record_counts(db: Session) -> Dict[str, int]:
+    """
+    Count records in the key tables, reusing results for METRICS_CACHE_TTL seconds
+
+    Args:
+        db: Database session
+
+    Returns:
+        Dict with users, projects, zones, assignments and per-status assignment counts
+    """
+    if time.monotonic() - _counts_cache["ts"] < settings.METRICS_CACHE_TTL:
+        return _counts_cache["counts"]
+
+    with _counts_lock:
+        # Another request may have refreshed the counts while we waited
+        if time.monotonic() - _counts_cache["ts"] < settings.METRICS_CACHE_TTL:
+            return _counts_cache["counts"]
+
+        counts = dict(db.execute(_RECORD_COUNTS_SQL).mappings().one())
+        _counts_cache["counts"] = counts
+        _counts_cache["ts"] = time.monotonic()
+        return counts
+
 
 @router.get("/health", status_code=status.HTTP_200_OK)
 async def health_liveness():
@@ -26,7 +102,7 @@ async def health_liveness():
 
 
 @router.get("/health/ready", status_code=status.HTTP_200_OK)
-async def health_readiness(db: Session = Depends(get_db)):
+def health_readiness(db: Session = Depends(get_db)):
     """
     Readiness probe - Returns 200 if server is ready to accept traffic
     Checks database connectivity and critical dependencies
@@ -42,11 +118,9 @@ async def health_readiness(db: Session = Depends(get_db)):
         db.execute(text("SELECT 1"))
         checks["database"] = True
 
-        # Check PostGIS extension
-        result = db.execute(text("SELECT PostGIS_version()"))
-        postgis_version = result.scalar()
+        # Check PostGIS extension (verified once, then served from the version cache)
+        checks["postgis_version"] = _get_versions(db)["postgis_version"]
         checks["postgis"] = True
-        checks["postgis_version"] = postgis_version
 
     except Exception as e:
         logger.error(f"Readiness check failed: {e}")
@@ -72,20 +146,20 @@ async def health_readiness(db: Session = Depends(get_db)):
 
 
 @router.get("/health/detailed", status_code=status.HTTP_200_OK)
-async def health_detailed(db: Session = Depends(get_db)):
+def health_detailed(db: Session = Depends(get_db)):
     """
     Detailed health check with all system components
     Provides comprehensive status for monitoring dashboards
     """
     # Import here to avoid circular dependency
-    from app.main import SERVER_START_TIME
+    from app.main import SERVER_START_TIME, SERVER_START_TIME_ISO
 
     health_data: Dict[str, Any] = {
         "status": "healthy",
         "timestamp": datetime.utcnow().isoformat(),
         "version": settings.APP_VERSION,
         "uptime_seconds": (datetime.utcnow() - SERVER_START_TIME).total_seconds(),
-        "start_time": SERVER_START_TIME.isoformat(),
+        "start_time": SERVER_START_TIME_ISO,
         "components": {}
     }
 
@@ -100,27 +174,19 @@ async def health_detailed(db: Session = Depends(get_db)):
     try:
         db.execute(text("SELECT 1"))
 
-        # Get database version
-        db_version_result = db.execute(text("SELECT version()"))
-        db_version = db_version_result.scalar()
-
-        # Get PostGIS version
-        postgis_result = db.execute(text("SELECT PostGIS_version()"))
-        postgis_version = postgis_result.scalar()
-
-        # Get pgvector version if available
-        try:
-            pgvector_result = db.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))
-            pgvector_version = pgvector_result.scalar()
-        except:
-            pgvector_version = None
+        # Get database, PostGIS and pgvector versions (cached after the first call)
+        versions = _get_versions(db)
+        db_version = versions["db_version"]
+        postgis_version = versions["postgis_version"]
+        pgvector_version = versions["pgvector_version"]
 
         # Count total records in key tables
         try:
-            users_count = db.execute(text("SELECT COUNT(*) FROM users")).scalar()
-            projects_count = db.execute(text("SELECT COUNT(*) FROM projects")).scalar()
-            zones_count = db.execute(text("SELECT COUNT(*) FROM zones")).scalar()
-            assignments_count = db.execute(text("SELECT COUNT(*) FROM zone_assignments")).scalar()
+            counts = _get_record_counts(db)
+            users_count = counts["users"]
+            projects_count = counts["projects"]
+            zones_count = counts["zones"]
+            assignments_count = counts["assignments"]
         except:
             users_count = projects_count = zones_count = assignments_count = None
 
@@ -164,19 +230,21 @@ async def health_detailed(db: Session = Depends(get_db)):
 
 
 @router.get("/health/startup", status_code=status.HTTP_200_OK)
-async def health_startup(db: Session = Depends(get_db)):
+def health_startup(db: Session = Depends(get_db)):
     """
     Startup probe - Checks if application has fully initialized
     Used by container orchestrators during application startup
     """
-    try:
-        # Verify database connection
-        db.execute(text("SELECT 1"))
+    global _startup_complete
 
-        # Verify critical tables exist
-        tables_to_check = ["users", "projects", "zones", "zone_assignments"]
-        for table in tables_to_check:
-            db.execute(text(f"SELECT 1 FROM {table} LIMIT 1"))
+    try:
+        # Verify database connection and that critical tables exist in one round trip;
+        # once this has succeeded the probe no longer touches the database
+        if not _startup_complete:
+            found = db.execute(_STARTUP_TABLES_SQL, {"names": _STARTUP_TABLES}).scalar()
+            if found != len(_STARTUP_TABLES):
+                raise RuntimeError(f"Only {found} of {len(_STARTUP_TABLES)} required tables exist")
+            _startup_complete = True
 
         return {
             "status": "started",
@@ -193,58 +261,58 @@ async def health_startup(db: Session = Depends(get_db)):
         }
 
 
-@router.get("/metrics", status_code=status.HTTP_200_OK)
-async def metrics(db: Session = Depends(get_db)):
-    """
-    Prometheus-compatible metrics endpoint
-    Returns basic metrics in a format that Prometheus can scrape
-    """
-    try:
-        # Import here to avoid circular dependency
-        from app.main import SERVER_START_TIME
-
-        # Get uptime
-        uptime = (datetime.utcnow() - SERVER_START_TIME).total_seconds()
-
-        # Get database stats
-        users_count = db.execute(text("SELECT COUNT(*) FROM users")).scalar()
-        projects_count = db.execute(text("SELECT COUNT(*) FROM projects")).scalar()
-        zones_count = db.execute(text("SELECT COUNT(*) FROM zones")).scalar()
-        assignments_count = db.execute(text("SELECT COUNT(*) FROM zone_assignments")).scalar()
-
-        # Get assignment status breakdown
-        assigned_count = db.execute(text("SELECT COUNT(*) FROM zone_assignments WHERE status = 'assigned'")).scalar()
-        in_progress_count = db.execute(text("SELECT COUNT(*) FROM zone_assignments WHERE status = 'in_progress'")).scalar()
-        completed_count = db.execute(text("SELECT COUNT(*) FROM zone_assignments WHERE status = 'completed'")).scalar()
-
-        # Return Prometheus-style metrics
-        metrics_text = f"""# HELP flyers_uptime_seconds Application uptime in seconds
+# Prometheus text exposition format; built once, filled in per scrape
+_METRICS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+_METRICS_TEMPLATE = """# HELP flyers_uptime_seconds Application uptime in seconds
 # TYPE flyers_uptime_seconds gauge
 flyers_uptime_seconds {uptime}
 
 # HELP flyers_users_total Total number of users
 # TYPE flyers_users_total gauge
-flyers_users_total {users_count}
+flyers_users_total {users}
 
 # HELP flyers_projects_total Total number of projects
 # TYPE flyers_projects_total gauge
-flyers_projects_total {projects_count}
+flyers_projects_total {projects}
 
 # HELP flyers_zones_total Total number of zones
 # TYPE flyers_zones_total gauge
-flyers_zones_total {zones_count}
+flyers_zones_total {zones}
 
 # HELP flyers_assignments_total Total number of zone assignments
 # TYPE flyers_assignments_total gauge
-flyers_assignments_total {assignments_count}
+flyers_assignments_total {assignments}
 
 # HELP flyers_assignments_by_status Number of assignments by status
 # TYPE flyers_assignments_by_status gauge
-flyers_assignments_by_status{{status="assigned"}} {assigned_count}
-flyers_assignments_by_status{{status="in_progress"}} {in_progress_count}
-flyers_assignments_by_status{{status="completed"}} {completed_count}
+flyers_assignments_by_status{{status="assigned"}} {assigned}
+flyers_assignments_by_status{{status="in_progress"}} {in_progress}
+flyers_assignments_by_status{{status="completed"}} {completed}
 """
-        return metrics_text
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK, response_class=PlainTextResponse)
+def metrics(db: Session = Depends(get_db)):
+    """
+    Prometheus-compatible metrics endpoint
+    Returns basic metrics in a format that Prometheus can scrape
+    """
+    try:
+        # Import here to avoid circular dependency
+        from app.main import SERVER_START_TIME
+
+        # Get uptime
+        uptime = (datetime.utcnow() - SERVER_START_TIME).total_seconds()
+
+        # Get database stats and assignment status breakdown
+        values = dict(_get_record_counts(db), uptime=uptime)
+
+        # Return Prometheus-style metrics
+        return PlainTextResponse(_METRICS_TEMPLATE.format_map(values), media_type=_METRICS_MEDIA_TYPE)
     except Exception as e:
         logger.error(f"Metrics collection failed: {e}")
-        return f"# Error collecting metrics: {str(e)}"
+        return PlainTextResponse(
+            f"# Error collecting metrics: {str(e)}\n",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            media_type=_METRICS_MEDIA_TYPE
+        )
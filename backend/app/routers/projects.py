@@ -1,13 +1,19 @@
 """Project management endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import and_, or_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional, Tuple
 from uuid import UUID
 
+from app.config import settings
 from app.database import get_db
 from app.dependencies import get_current_user
 from app.models.user import User
 from app.models.project import Project, ProjectCollaborator, CollaboratorRole
+from app.utils.auth_cache import load_user_by_email
+from app.utils.shared_cache import SHARED_ACROSS_WORKERS, cache_get, cache_set, cache_delete
 from app.schemas.project import (
     ProjectCreate,
     ProjectUpdate,
@@ -20,12 +26,121 @@ from app.schemas.project import (
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
+# Shared cache value for the project owner; collaborators store their role value
+# and users without access store ""
+_OWNER_ACCESS = "*"
+
+
+def _acl_cache_key(project_id: UUID, user_id: UUID) -> str:
+    """Shared cache key for a user's access to a project"""
+    return f"acl:{user_id}:{project_id}"
+
+
+def _get_cached_access(project_id: UUID, user_id: UUID, db: Session) -> Optional[Tuple[bool, Optional[CollaboratorRole]]]:
+    """
+    Look up a user's remembered access to a project without touching the database
+
+    The session is request-scoped, so results are kept in db.info and a second
+    access check in the same request (e.g. view then organizer) is free.
+    Across requests access is cached in the shared cache for ACL_CACHE_TTL,
+    unless that cache is per-process with several workers: a revocation would
+    then only be seen by the worker that handled it.
+
+    Returns:
+        (is_owner, collaborator_role), or None if nothing is cached
+    """
+    memo = db.info.setdefault("project_access", {})
+    key = (project_id, user_id)
+    if key in memo:
+        return memo[key]
+
+    if not SHARED_ACROSS_WORKERS:
+        return None
+
+    cached = cache_get(_acl_cache_key(project_id, user_id))
+    if cached is None:
+        return None
+
+    if cached == _OWNER_ACCESS:
+        access = (True, None)
+    else:
+        access = (False, CollaboratorRole(cached) if cached else None)
+
+    memo[key] = access
+    return access
+
+
+def _remember_access(project_id: UUID, user_id: UUID, is_owner: bool, role, db: Session) -> None:
+    """Store a user's access in the request memo and shared cache"""
+    db.info.setdefault("project_access", {})[(project_id, user_id)] = (is_owner, role)
+    if not SHARED_ACROSS_WORKERS:
+        return
+    value = _OWNER_ACCESS if is_owner else (role.value if role else "")
+    cache_set(_acl_cache_key(project_id, user_id), value, settings.ACL_CACHE_TTL)
+
+
+def _invalidate_access(project_id: UUID, user_id: UUID, db: Session) -> None:
+    """Forget a user's cached access after the membership changed"""
+    db.info.get("project_access", {}).pop((project_id, user_id), None)
+    cache_delete(_acl_cache_key(project_id, user_id))
+
+
+def _get_collaborator_role(project_id: UUID, user_id: UUID, db: Session):
+    """
+    Look up a non-owner's collaborator role on a project, using the access caches
+
+    Returns:
+        CollaboratorRole, or None if the user isn't a collaborator
+    """
+    access = _get_cached_access(project_id, user_id, db)
+    if access is not None:
+        return access[1]
+
+    role = db.query(ProjectCollaborator.role).filter(
+        ProjectCollaborator.project_id == project_id,
+        ProjectCollaborator.user_id == user_id
+    ).scalar()
+    _remember_access(project_id, user_id, False, role, db)
+    return role
+
+
+def _enforce_access(is_owner: bool, collaborator_role, required_role: CollaboratorRole = None) -> None:
+    """
+    Raise unless the user's access satisfies required_role
+
+    Raises:
+        HTTPException: 403 if the user has no access or too low a role
+    """
+    has_access = is_owner or collaborator_role is not None
+
+    if not has_access:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You don't have access to this project"
+        )
+
+    # Check role if required
+    if required_role:
+        if required_role == CollaboratorRole.OWNER and not is_owner:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Only the project owner can perform this action"
+            )
+
+        if required_role == CollaboratorRole.ORGANIZER:
+            if not is_owner and collaborator_role not in [CollaboratorRole.OWNER, CollaboratorRole.ORGANIZER]:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail="You need organizer or owner permissions to perform this action"
+                )
+
+
 def check_project_access(
     project_id: UUID,
     user: User,
     db: Session,
     required_role: CollaboratorRole = None
-) -> Project:
+) -> Tuple[Project, Optional[CollaboratorRole]]:
     """
     Check if user has access to a project
 
@@ -36,12 +151,28 @@ def check_project_access(
         required_role: Required role (owner or organizer)
 
     Returns:
-        Project if user has access
+        (project, user_role) if user has access; user_role is OWNER for the owner
 
     Raises:
         HTTPException: If project not found or user doesn't have access
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    if (project_id, user.id) in db.info.get("project_access", {}) or required_role == CollaboratorRole.OWNER:
+        # Already checked in this request (Session.get serves the project from the identity map),
+        # or only ownership matters, so there's no collaborator role to join
+        project = db.get(Project, project_id)
+    else:
+        # Project and the user's collaborator role in one round trip
+        row = db.query(Project, ProjectCollaborator.role)\
+            .outerjoin(ProjectCollaborator, and_(
+                ProjectCollaborator.project_id == Project.id,
+                ProjectCollaborator.user_id == user.id
+            ))\
+            .filter(Project.id == project_id)\
+            .first()
+
+        project = row[0] if row else None
+        if project:
+            _remember_access(project_id, user.id, project.owner_id == user.id, row[1], db)
 
     if not project:
         raise HTTPException(
@@ -49,94 +180,175 @@ def check_project_access(
             detail="Project not found"
         )
 
-    # Check if user is owner or collaborator
+    return check_project_permissions(project, user, db, required_role)
+
+
+def check_project_permissions(
+    project: Project,
+    user: User,
+    db: Session,
+    required_role: CollaboratorRole = None
+) -> Tuple[Project, Optional[CollaboratorRole]]:
+    """
+    Check if user has access to an already-loaded project
+
+    Use this instead of check_project_access when the caller has the Project
+    in hand (e.g. eager-loaded through a zone), to skip re-fetching it.
+
+    Args:
+        project: Project to check
+        user: Current user
+        db: Database session
+        required_role: Required role (owner or organizer)
+
+    Returns:
+        (project, user_role) if user has access; user_role is OWNER for the owner
+
+    Raises:
+        HTTPException: If user doesn't have access
+    """
+    # Check if user is owner or collaborator (owners never need the lookup)
     is_owner = project.owner_id == user.id
-    collaborator = db.query(ProjectCollaborator).filter(
-        ProjectCollaborator.project_id == project_id,
-        ProjectCollaborator.user_id == user.id
-    ).first()
+    collaborator_role = None if is_owner else _get_collaborator_role(project.id, user.id, db)
 
-    has_access = is_owner or collaborator is not None
+    _enforce_access(is_owner, collaborator_role, required_role)
 
-    if not has_access:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have access to this project"
-        )
+    return project, CollaboratorRole.OWNER if is_owner else collaborator_role
 
-    # Check role if required
-    if required_role:
-        if required_role == CollaboratorRole.OWNER and not is_owner:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only the project owner can perform this action"
-            )
 
-        if required_role == CollaboratorRole.ORGANIZER:
-            if not is_owner and (not collaborator or collaborator.role not in [CollaboratorRole.OWNER, CollaboratorRole.ORGANIZER]):
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="You need organizer or owner permissions to perform this action"
-                )
+def require_project_role(
+    project_id: UUID,
+    user: User,
+    db: Session,
+    required_role: CollaboratorRole = None
+) -> Optional[CollaboratorRole]:
+    """
+    Check project access for callers that don't need the Project itself
 
-    return project
+    Served from the access caches when warm, so the check costs no query;
+    falls back to check_project_access on a miss.
+
+    Args:
+        project_id: Project ID
+        user: Current user
+        db: Database session
+        required_role: Required role (owner or organizer)
+
+    Returns:
+        The user's role (OWNER for the owner)
+
+    Raises:
+        HTTPException: If project not found or user doesn't have access
+    """
+    access = _get_cached_access(project_id, user.id, db)
+    if access is None:
+        _, user_role = check_project_access(project_id, user, db, required_role)
+        return user_role
+
+    is_owner, collaborator_role = access
+    _enforce_access(is_owner, collaborator_role, required_role)
+    return CollaboratorRole.OWNER if is_owner else collaborator_role
+
+
+# Response helpers build plain dicts from ORM rows, and handlers return them as
+# ORJSONResponse so FastAPI skips re-validating trusted data against response_model
+# (which is kept for the OpenAPI schema)
+
+# Project columns a response needs, for listings that don't need full ORM objects
+_PROJECT_RESPONSE_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.description,
+    Project.owner_id,
+    Project.is_active,
+    Project.status,
+    Project.created_at,
+    Project.updated_at
+)
+
+
+def _project_dict(project, user_role: Optional[CollaboratorRole]) -> dict:
+    """Project fields for a response (from a Project or a _PROJECT_RESPONSE_COLUMNS row), with the current user's role"""
+    return {
+        "id": project.id,
+        "name": project.name,
+        "description": project.description,
+        "owner_id": project.owner_id,
+        "is_active": project.is_active,
+        "status": project.status,
+        "created_at": project.created_at,
+        "updated_at": project.updated_at,
+        "user_role": user_role
+    }
+
+
+def _collaborator_dict(collab: ProjectCollaborator, user: User) -> dict:
+    """Collaborator fields for a response, enriched with the user's email and name"""
+    return {
+        "id": collab.id,
+        "project_id": collab.project_id,
+        "user_id": collab.user_id,
+        "role": collab.role,
+        "invited_by": collab.invited_by,
+        "invited_at": collab.invited_at,
+        "user_email": user.email if user else None,
+        "user_name": user.name if user else None
+    }
+
+
+def _get_collaborators(project_id: UUID, db: Session) -> List[dict]:
+    """
+    Get a project's collaborators with user details
+
+    Users are joined in the same query instead of being loaded one per collaborator.
+    Each collaborator has exactly one user, so the join can't fan out rows; and
+    user_id is NOT NULL, so it can be an inner join.
+
+    Args:
+        project_id: Project ID
+        db: Database session
+
+    Returns:
+        List of collaborator dicts
+    """
+    collaborators = db.query(ProjectCollaborator)\
+        .options(joinedload(ProjectCollaborator.user, innerjoin=True).load_only(User.id, User.email, User.name))\
+        .filter(ProjectCollaborator.project_id == project_id)\
+        .all()
+
+    return [_collaborator_dict(collab, collab.user) for collab in collaborators]
 
 
 @router.get("", response_model=List[ProjectResponse])
-async def list_projects(
+def list_projects(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get list of projects the user owns or collaborates on"""
-    # Get projects owned by user
-    owned_projects = db.query(Project).filter(
-        Project.owner_id == current_user.id
-    ).all()
-
-    # Get projects user collaborates on
-    collaborations = db.query(ProjectCollaborator).filter(
-        ProjectCollaborator.user_id == current_user.id
-    ).all()
-
-    collab_projects = [
-        db.query(Project).filter(Project.id == collab.project_id).first()
-        for collab in collaborations
-    ]
-
-    # Combine and deduplicate
-    all_projects = list({p.id: p for p in owned_projects + collab_projects}.values())
+    # Owned and collaborated projects with the user's role in one query; the
+    # (project_id, user_id) uniqueness keeps the outer join to one row per project
+    rows = db.query(*_PROJECT_RESPONSE_COLUMNS, ProjectCollaborator.role)\
+        .outerjoin(ProjectCollaborator, and_(
+            ProjectCollaborator.project_id == Project.id,
+            ProjectCollaborator.user_id == current_user.id
+        ))\
+        .filter(or_(
+            Project.owner_id == current_user.id,
+            ProjectCollaborator.user_id == current_user.id
+        ))\
+        .all()
 
     # Enrich with user_role
     enriched_projects = []
-    for project in all_projects:
-        # Determine user's role
-        if project.owner_id == current_user.id:
-            user_role = CollaboratorRole.OWNER
-        else:
-            collab = db.query(ProjectCollaborator).filter(
-                ProjectCollaborator.project_id == project.id,
-                ProjectCollaborator.user_id == current_user.id
-            ).first()
-            user_role = collab.role if collab else None
-
-        project_dict = {
-            "id": project.id,
-            "name": project.name,
-            "description": project.description,
-            "owner_id": project.owner_id,
-            "is_active": project.is_active,
-            "status": project.status,
-            "created_at": project.created_at,
-            "updated_at": project.updated_at,
-            "user_role": user_role
-        }
-        enriched_projects.append(project_dict)
-
-    return enriched_projects
+    for row in rows:
+        user_role = CollaboratorRole.OWNER if row.owner_id == current_user.id else row.role
+        enriched_projects.append(_project_dict(row, user_role))
+
+    return ORJSONResponse(enriched_projects)
 
 
 @router.post("", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
-async def create_project(
+def create_project(
     project_data: ProjectCreate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -156,59 +368,29 @@ async def create_project(
 
 
 @router.get("/{project_id}", response_model=ProjectWithCollaborators)
-async def get_project(
+def get_project(
     project_id: UUID,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get project details with collaborators"""
-    project = check_project_access(project_id, current_user, db)
+    project, user_role = check_project_access(project_id, current_user, db)
 
     # Get collaborators with user details
-    collaborators = db.query(ProjectCollaborator).filter(
-        ProjectCollaborator.project_id == project_id
-    ).all()
-
-    # Enrich collaborator data with user info
-    enriched_collaborators = []
-    for collab in collaborators:
-        user = db.query(User).filter(User.id == collab.user_id).first()
-        collab_dict = {
-            "id": collab.id,
-            "project_id": collab.project_id,
-            "user_id": collab.user_id,
-            "role": collab.role,
-            "invited_by": collab.invited_by,
-            "invited_at": collab.invited_at,
-            "user_email": user.email if user else None,
-            "user_name": user.name if user else None
-        }
-        enriched_collaborators.append(CollaboratorResponse(**collab_dict))
-
-    project_dict = {
-        "id": project.id,
-        "name": project.name,
-        "description": project.description,
-        "owner_id": project.owner_id,
-        "is_active": project.is_active,
-        "status": project.status,
-        "created_at": project.created_at,
-        "updated_at": project.updated_at,
-        "collaborators": enriched_collaborators
-    }
+    enriched_collaborators = _get_collaborators(project_id, db)
 
-    return ProjectWithCollaborators(**project_dict)
+    return ORJSONResponse(dict(_project_dict(project, user_role), collaborators=enriched_collaborators))
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
-async def update_project(
+def update_project(
     project_id: UUID,
     project_data: ProjectUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update a project (owner or organizer only)"""
-    project = check_project_access(project_id, current_user, db, CollaboratorRole.ORGANIZER)
+    project, user_role = check_project_access(project_id, current_user, db, CollaboratorRole.ORGANIZER)
 
     # Update fields
     if project_data.name is not None:
@@ -221,70 +403,54 @@ async def update_project(
     db.commit()
     db.refresh(project)
 
-    return project
+    return ORJSONResponse(_project_dict(project, user_role))
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_project(
+def delete_project(
     project_id: UUID,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete a project (owner only)"""
-    project = check_project_access(project_id, current_user, db, CollaboratorRole.OWNER)
+    project, _ = check_project_access(project_id, current_user, db, CollaboratorRole.OWNER)
+    member_ids = [project.owner_id] + [collab.user_id for collab in project.collaborators]
 
     db.delete(project)
     db.commit()
 
+    for member_id in member_ids:
+        _invalidate_access(project_id, member_id, db)
+
     return None
 
 
 # Collaborator endpoints
 
 @router.get("/{project_id}/collaborators", response_model=List[CollaboratorResponse])
-async def list_collaborators(
+def list_collaborators(
     project_id: UUID,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get list of project collaborators"""
-    check_project_access(project_id, current_user, db)
-
-    collaborators = db.query(ProjectCollaborator).filter(
-        ProjectCollaborator.project_id == project_id
-    ).all()
-
-    # Enrich with user details
-    enriched_collaborators = []
-    for collab in collaborators:
-        user = db.query(User).filter(User.id == collab.user_id).first()
-        collab_dict = {
-            "id": collab.id,
-            "project_id": collab.project_id,
-            "user_id": collab.user_id,
-            "role": collab.role,
-            "invited_by": collab.invited_by,
-            "invited_at": collab.invited_at,
-            "user_email": user.email if user else None,
-            "user_name": user.name if user else None
-        }
-        enriched_collaborators.append(CollaboratorResponse(**collab_dict))
-
-    return enriched_collaborators
+    require_project_role(project_id, current_user, db)
+
+    return ORJSONResponse(_get_collaborators(project_id, db))
 
 
 @router.post("/{project_id}/collaborators", response_model=CollaboratorResponse, status_code=status.HTTP_201_CREATED)
-async def invite_collaborator(
+def invite_collaborator(
     project_id: UUID,
     invite_data: CollaboratorInvite,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Invite a collaborator to the project (owner or organizer only)"""
-    project = check_project_access(project_id, current_user, db, CollaboratorRole.ORGANIZER)
+    project, _ = check_project_access(project_id, current_user, db, CollaboratorRole.ORGANIZER)
 
-    # Find user by email
-    user = db.query(User).filter(User.email == invite_data.email).first()
+    # Find user by email (served from the email and user caches when warm)
+    user = load_user_by_email(invite_data.email, db)
 
     if not user:
         raise HTTPException(
@@ -292,18 +458,6 @@ async def invite_collaborator(
             detail=f"User with email {invite_data.email} not found"
         )
 
-    # Check if user is already a collaborator
-    existing = db.query(ProjectCollaborator).filter(
-        ProjectCollaborator.project_id == project_id,
-        ProjectCollaborator.user_id == user.id
-    ).first()
-
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="User is already a collaborator on this project"
-        )
-
     # Check if user is the owner
     if user.id == project.owner_id:
         raise HTTPException(
@@ -311,42 +465,44 @@ async def invite_collaborator(
             detail="Cannot add owner as a collaborator"
         )
 
-    # Create collaborator
-    collaborator = ProjectCollaborator(
-        project_id=project_id,
-        user_id=user.id,
-        role=invite_data.role,
-        invited_by=current_user.id
-    )
+    # Create collaborator; the unique (project_id, user_id) index detects existing
+    # collaborators atomically, so concurrent invites can't race past a separate check
+    collaborator = db.scalars(
+        pg_insert(ProjectCollaborator)
+        .values(
+            project_id=project_id,
+            user_id=user.id,
+            role=invite_data.role,
+            invited_by=current_user.id
+        )
+        .on_conflict_do_nothing(index_elements=[ProjectCollaborator.project_id, ProjectCollaborator.user_id])
+        .returning(ProjectCollaborator)
+    ).first()
+
+    if not collaborator:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User is already a collaborator on this project"
+        )
 
-    db.add(collaborator)
+    # Build the enriched response before commit expires the returned row
+    content = _collaborator_dict(collaborator, user)
     db.commit()
-    db.refresh(collaborator)
-
-    # Return enriched response
-    collab_dict = {
-        "id": collaborator.id,
-        "project_id": collaborator.project_id,
-        "user_id": collaborator.user_id,
-        "role": collaborator.role,
-        "invited_by": collaborator.invited_by,
-        "invited_at": collaborator.invited_at,
-        "user_email": user.email,
-        "user_name": user.name
-    }
+    _invalidate_access(project_id, user.id, db)
 
-    return CollaboratorResponse(**collab_dict)
+    return ORJSONResponse(content, status_code=status.HTTP_201_CREATED)
 
 
 @router.delete("/{project_id}/collaborators/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_collaborator(
+def remove_collaborator(
     project_id: UUID,
     user_id: UUID,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Remove a collaborator from the project (owner or organizer only)"""
-    check_project_access(project_id, current_user, db, CollaboratorRole.ORGANIZER)
+    require_project_role(project_id, current_user, db, CollaboratorRole.ORGANIZER)
 
     collaborator = db.query(ProjectCollaborator).filter(
         ProjectCollaborator.project_id == project_id,
@@ -361,5 +517,6 @@ async def remove_collaborator(
 
     db.delete(collaborator)
     db.commit()
+    _invalidate_access(project_id, user_id, db)
 
     return None
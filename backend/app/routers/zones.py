@@ -1,13 +1,17 @@
 """Zone management routes"""
 import logging
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, defer
 from typing import List
 from uuid import UUID
-import json
+import orjson
+from lxml import etree
 
 from app.database import get_db
-from app.models import Zone, Project
+from app.models import Zone
 from app.models.user import User
 from app.schemas.zone import (
     Zone as ZoneSchema,
@@ -17,71 +21,56 @@ from app.schemas.zone import (
     KMLImportResponse
 )
 from app.routers.auth import get_current_user
-from app.utils.kml_parser import parse_kml, convert_geojson_to_wkt
-from geoalchemy2.elements import WKTElement
+from app.routers.projects import require_project_role
+from app.utils.kml_parser import iter_kml_zones, convert_geojson_to_ewkb
+from app.utils.zone_geojson import get_zone_geojson
+from geoalchemy2.elements import WKBElement
 
 router = APIRouter(prefix="/zones", tags=["zones"])
 logger = logging.getLogger(__name__)
 
+# Zones inserted per statement during a KML import
+KML_IMPORT_BATCH_SIZE = 500
 
-def _check_project_access(project_id: UUID, user: User, db: Session) -> Project:
-    """Check if user has access to project"""
-    project = db.query(Project).filter(Project.id == project_id).first()
 
-    if not project:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Project not found"
-        )
+def _zone_dict(zone: Zone, geojson: str) -> dict:
+    """
+    Zone fields for an ORJSONResponse
 
-    # Check if user is owner or collaborator
-    is_owner = project.owner_id == user.id
-    is_collaborator = any(
-        collab.user_id == user.id
-        for collab in project.collaborators
-    )
-
-    if not (is_owner or is_collaborator):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have access to this project"
-        )
-
-    return project
+    The GeoJSON from PostGIS is already text, so it is spliced into the response
+    as an orjson.Fragment instead of being parsed and re-encoded.
+    """
+    return {
+        "id": zone.id,
+        "project_id": zone.project_id,
+        "name": zone.name,
+        "description": zone.description,
+        "geometry": orjson.Fragment(geojson),
+        "color": zone.color,
+        "kml_metadata": zone.kml_metadata,
+        "created_at": zone.created_at,
+        "updated_at": zone.updated_at
+    }
 
 
 @router.get("/project/{project_id}", response_model=List[ZoneSchema])
-async def get_project_zones(
+def get_project_zones(
     project_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get all zones for a project"""
-    _check_project_access(project_id, current_user, db)
+    require_project_role(project_id, current_user, db)
 
-    zones = db.query(Zone).filter(Zone.project_id == project_id).all()
+    # Zone columns without the geometry; GeoJSON comes from the cache or one batched query
+    zones = db.query(Zone).options(defer(Zone.geometry)).filter(Zone.project_id == project_id).all()
+    geojson = get_zone_geojson((zone.id for zone in zones), db)
 
-    # Convert geometry to GeoJSON for each zone
-    result = []
-    for zone in zones:
-        zone_dict = {
-            "id": zone.id,
-            "project_id": zone.project_id,
-            "name": zone.name,
-            "description": zone.description,
-            "geometry": json.loads(db.scalar(zone.geometry.ST_AsGeoJSON())),  # Parse GeoJSON string to dict
-            "color": zone.color,
-            "kml_metadata": zone.kml_metadata,
-            "created_at": zone.created_at,
-            "updated_at": zone.updated_at
-        }
-        result.append(zone_dict)
-
-    return result
+    return ORJSONResponse([_zone_dict(zone, geojson[zone.id]) for zone in zones])
 
 
 @router.post("/preview-kml")
-async def preview_kml(
+def preview_kml(
     request: KMLImportRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -89,20 +78,22 @@ async def preview_kml(
     """Preview zones from KML file without importing"""
 
     # Check project access
-    _check_project_access(request.project_id, current_user, db)
+    require_project_role(request.project_id, current_user, db)
 
-    # Parse KML
-    zones_data, errors = parse_kml(request.kml_content)
+    # Parse KML, keeping only the names for duplicate checking
+    errors = []
+    try:
+        zone_names = [zone_data['name'] for zone_data in iter_kml_zones(request.kml_content, errors)]
+    except etree.XMLSyntaxError as e:
+        zone_names = []
+        errors.append(f"Invalid KML format: {str(e)}")
 
-    if not zones_data and errors:
+    if not zone_names and errors:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Failed to parse KML: {'; '.join(errors)}"
         )
 
-    # Return zone names for duplicate checking
-    zone_names = [zone_data['name'] for zone_data in zones_data]
-
     return {
         "zone_count": len(zone_names),
         "zone_names": zone_names,
@@ -111,7 +102,7 @@ async def preview_kml(
 
 
 @router.post("/import-kml", response_model=KMLImportResponse)
-async def import_kml(
+def import_kml(
     request: KMLImportRequest,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -119,58 +110,86 @@ async def import_kml(
     """Import zones from KML file"""
 
     # Check project access
-    project = _check_project_access(request.project_id, current_user, db)
+    require_project_role(request.project_id, current_user, db)
+
+    zones_to_skip = request.zones_to_skip or []
 
-    # Parse KML
-    zones_data, errors = parse_kml(request.kml_content)
+    # Lowercased skip names in a frozenset for O(1) case-insensitive membership checks
+    zones_to_skip_lower = frozenset(name.lower() for name in zones_to_skip)
 
-    if not zones_data and errors:
+    logger.debug("Received zones_to_skip: %s", zones_to_skip)
+    logger.info(f"Processing KML import: {len(zones_to_skip)} zones to skip")
+
+    # Placemarks are parsed one at a time and inserted in batches, so only one
+    # batch of input rows is held in memory; everything commits together at the end
+    errors = []
+    batch = []
+    created_zones = []
+    zones_in_file = 0
+    zones_skipped = 0
+
+    try:
+        for zone_data in iter_kml_zones(request.kml_content, errors):
+            zones_in_file += 1
+
+            # Skip zones that user declined to import (case-insensitive)
+            if zone_data['name'].lower() in zones_to_skip_lower:
+                zones_skipped += 1
+                # Lazy %-formatting: per-zone messages are only built when DEBUG is enabled
+                logger.debug("✓ SKIPPING zone '%s' (found in skip list)", zone_data['name'])
+                continue
+
+            logger.debug("→ IMPORTING zone '%s' (not in skip list)", zone_data['name'])
+
+            try:
+                # Convert GeoJSON to EWKB for PostGIS
+                ewkb = convert_geojson_to_ewkb(zone_data['geometry'])
+            except Exception as e:
+                errors.append(f"Failed to create zone '{zone_data['name']}': {str(e)}")
+                continue
+
+            batch.append({
+                "project_id": request.project_id,
+                "name": zone_data['name'],
+                "description": zone_data.get('description'),
+                "geometry": WKBElement(ewkb, srid=4326, extended=True),
+                "color": zone_data.get('color'),
+                "kml_metadata": zone_data.get('kml_metadata')
+            })
+
+            # RETURNING populates ids and timestamps for the response
+            if len(batch) >= KML_IMPORT_BATCH_SIZE:
+                created_zones.extend(db.scalars(insert(Zone).returning(Zone), batch).all())
+                batch.clear()
+
+        if batch:
+            created_zones.extend(db.scalars(insert(Zone).returning(Zone), batch).all())
+            batch.clear()
+    except etree.XMLSyntaxError as e:
+        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Failed to parse KML: {'; '.join(errors)}"
+            detail=f"Failed to parse KML: Invalid KML format: {str(e)}"
+        )
+    except DBAPIError as e:
+        db.rollback()
+        logger.error(f"Failed to insert imported zones: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to import zones: {str(e.orig)}"
         )
 
-    # Create zones in database
-    created_zones = []
-    zones_to_skip = request.zones_to_skip or []
-
-    # Convert skip list to lowercase for case-insensitive comparison
-    zones_to_skip_lower = [name.lower() for name in zones_to_skip]
-
-    logger.debug(f"Received zones_to_skip: {zones_to_skip}")
-    logger.debug(f"zones_to_skip_lower: {zones_to_skip_lower}")
-    logger.debug(f"Zone names from KML: {[z['name'] for z in zones_data]}")
-    logger.info(f"Processing KML import: {len(zones_data)} zones in file, {len(zones_to_skip)} zones to skip")
-
-    for zone_data in zones_data:
-        # Skip zones that user declined to import (case-insensitive)
-        if zone_data['name'].lower() in zones_to_skip_lower:
-            logger.debug(f"✓ SKIPPING zone '{zone_data['name']}' (found in skip list)")
-            continue
-
-        logger.debug(f"→ IMPORTING zone '{zone_data['name']}' (not in skip list)")
-
-        try:
-            # Convert GeoJSON to WKT for PostGIS
-            wkt = convert_geojson_to_wkt(zone_data['geometry'])
-
-            # Create zone
-            zone = Zone(
-                project_id=request.project_id,
-                name=zone_data['name'],
-                description=zone_data.get('description'),
-                geometry=WKTElement(wkt, srid=4326),
-                color=zone_data.get('color'),
-                kml_metadata=zone_data.get('kml_metadata')
-            )
-
-            db.add(zone)
-            db.flush()  # Flush to get the ID
-
-            created_zones.append(zone)
+    if not zones_in_file and errors:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to parse KML: {'; '.join(errors)}"
+        )
 
-        except Exception as e:
-            errors.append(f"Failed to create zone '{zone_data['name']}': {str(e)}")
+    # Build the response before commit expires the returned rows, serializing
+    # all geometries in one query
+    geojson = get_zone_geojson((zone.id for zone in created_zones), db)
+    result_zones = [_zone_dict(zone, geojson[zone.id]) for zone in created_zones]
 
     # Commit if we created any zones
     if created_zones:
@@ -187,33 +206,17 @@ async def import_kml(
         # User skipped all zones - this is a valid operation
         db.rollback()
 
-    # Convert zones to response format
-    result_zones = []
-    for zone in created_zones:
-        zone_dict = {
-            "id": zone.id,
-            "project_id": zone.project_id,
-            "name": zone.name,
-            "description": zone.description,
-            "geometry": json.loads(db.scalar(zone.geometry.ST_AsGeoJSON())),  # Parse GeoJSON string to dict
-            "color": zone.color,
-            "kml_metadata": zone.kml_metadata,
-            "created_at": zone.created_at,
-            "updated_at": zone.updated_at
-        }
-        result_zones.append(zone_dict)
-
-    logger.info(f"KML import completed: {len(created_zones)} zones created, {len(zones_to_skip)} zones skipped, {len(errors)} errors")
+    logger.info(f"KML import completed: {zones_in_file} zones in file, {len(created_zones)} zones created, {zones_skipped} zones skipped, {len(errors)} errors")
 
-    return {
+    return ORJSONResponse({
         "zones_created": len(created_zones),
         "zones": result_zones,
         "errors": errors
-    }
+    })
 
 
 @router.delete("/project/{project_id}/all")
-async def delete_all_zones(
+def delete_all_zones(
     project_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -221,7 +224,7 @@ async def delete_all_zones(
     """Delete all zones for a project"""
 
     # Check project access
-    _check_project_access(project_id, current_user, db)
+    require_project_role(project_id, current_user, db)
 
     # Delete all zones for this project
     deleted_count = db.query(Zone).filter(Zone.project_id == project_id).delete()
@@ -231,7 +234,7 @@ async def delete_all_zones(
 
 
 @router.delete("/{zone_id}")
-async def delete_zone(
+def delete_zone(
     zone_id: UUID,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -247,7 +250,7 @@ async def delete_zone(
         )
 
     # Check project access
-    _check_project_access(zone.project_id, current_user, db)
+    require_project_role(zone.project_id, current_user, db)
 
     db.delete(zone)
     db.commit()
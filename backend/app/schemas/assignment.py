@@ -1,5 +1,5 @@
 """Assignment schemas for request/response validation"""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
 from uuid import UUID
 from datetime import datetime
 from typing import Optional, List
@@ -43,8 +43,7 @@ class AssignmentResponse(BaseModel):
     notes: Optional[str] = None
     manual_completion_percentage: Optional[int] = Field(None, ge=0, le=100)
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class AssignmentWithVolunteer(AssignmentResponse):
@@ -73,3 +72,8 @@ class VolunteerInfo(BaseModel):
     email: str
     picture_url: Optional[str] = None
     current_assignments_count: int
+
+
+# Built once so list responses are serialized by a single cached core schema
+# instead of FastAPI re-validating every item against response_model
+ASSIGNMENT_WITH_VOLUNTEER_LIST = TypeAdapter(List[AssignmentWithVolunteer])
@@ -1,5 +1,5 @@
 """Assignment note schemas"""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, AliasChoices, AliasPath, ConfigDict
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
@@ -16,16 +16,15 @@ class AssignmentNoteUpdate(BaseModel):
 
 
 class AssignmentNoteResponse(BaseModel):
-    """Note response with author details"""
+    """Note response with author details (read from note.author when built from an ORM object)"""
     id: UUID
     assignment_id: UUID
     user_id: UUID
     content: str
     created_at: datetime
     updated_at: datetime
-    author_name: Optional[str] = None
-    author_email: Optional[str] = None
-    author_picture_url: Optional[str] = None
+    author_name: Optional[str] = Field(None, validation_alias=AliasChoices("author_name", AliasPath("author", "name")))
+    author_email: Optional[str] = Field(None, validation_alias=AliasChoices("author_email", AliasPath("author", "email")))
+    author_picture_url: Optional[str] = Field(None, validation_alias=AliasChoices("author_picture_url", AliasPath("author", "picture_url")))
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,5 +1,5 @@
 """Completion area schemas for request/response validation"""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from uuid import UUID
 from datetime import datetime
 from typing import Optional
@@ -19,5 +19,4 @@ class CompletionAreaResponse(BaseModel):
     completed_at: datetime
     notes: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
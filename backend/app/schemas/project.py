@@ -1,5 +1,5 @@
 """Project schemas for request/response validation"""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
@@ -33,8 +33,7 @@ class ProjectResponse(BaseModel):
     updated_at: datetime
     user_role: Optional[CollaboratorRole] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # Collaborator schemas
@@ -63,13 +62,11 @@ class CollaboratorResponse(BaseModel):
     user_email: Optional[str] = None
     user_name: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProjectWithCollaborators(ProjectResponse):
     """Schema for project with collaborators"""
     collaborators: List[CollaboratorResponse] = []
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,15 +1,29 @@
 """Zone schemas for API requests and responses"""
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict, field_validator
 from typing import Optional, List, Any
 from datetime import datetime
 from uuid import UUID
 
 
+# Colors are validated by _validate_color; the pattern is only published in the OpenAPI schema
+_COLOR_PATTERN = r"^#[0-9A-Fa-f]{6}$"
+_HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+
+
+def _validate_color(color: Optional[str]) -> Optional[str]:
+    """Check a #rrggbb hex color with plain string tests rather than a regex"""
+    if color is not None and not (len(color) == 7 and color[0] == "#" and _HEX_DIGITS.issuperset(color[1:])):
+        raise ValueError("Color must be a hex color like #1a2b3c")
+    return color
+
+
 class ZoneBase(BaseModel):
     """Base zone schema"""
     name: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
-    color: Optional[str] = Field(None, pattern=r'^#[0-9A-Fa-f]{6}$')
+    color: Optional[str] = Field(None, json_schema_extra={"pattern": _COLOR_PATTERN})
+
+    _check_color = field_validator("color")(_validate_color)
 
 
 class ZoneCreate(ZoneBase):
@@ -22,9 +36,11 @@ class ZoneUpdate(BaseModel):
     """Schema for updating a zone"""
     name: Optional[str] = Field(None, min_length=1, max_length=255)
     description: Optional[str] = None
-    color: Optional[str] = Field(None, pattern=r'^#[0-9A-Fa-f]{6}$')
+    color: Optional[str] = Field(None, json_schema_extra={"pattern": _COLOR_PATTERN})
     kml_metadata: Optional[dict] = None
 
+    _check_color = field_validator("color")(_validate_color)
+
 
 class Zone(ZoneBase):
     """Schema for zone response"""
@@ -35,8 +51,7 @@ class Zone(ZoneBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ZoneWithStats(Zone):
@@ -78,5 +93,4 @@ class ZoneAssignment(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
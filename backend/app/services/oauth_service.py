@@ -1,7 +1,10 @@
 """Google OAuth service"""
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
+import base64
 import httpx
+import orjson
 import secrets
+import time
 from urllib.parse import urlencode
 from app.config import settings
 
@@ -12,11 +15,32 @@ class GoogleOAuthService:
     GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
     GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
     GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
+    GOOGLE_ISSUERS = ("https://accounts.google.com", "accounts.google.com")
 
     def __init__(self):
         self.client_id = settings.GOOGLE_CLIENT_ID
         self.client_secret = settings.GOOGLE_CLIENT_SECRET
         self.redirect_uri = settings.GOOGLE_REDIRECT_URI
+        # One pooled HTTP/2 client for every login, so the token and userinfo calls
+        # reuse a kept-alive TLS connection instead of handshaking each time
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared HTTP client, created on first use"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(10.0),
+                limits=httpx.Limits(max_keepalive_connections=8, max_connections=16)
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (called on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     def generate_auth_url(self) -> tuple[str, str]:
         """
@@ -45,15 +69,15 @@ class GoogleOAuthService:
         auth_url = f"{self.GOOGLE_AUTH_URL}?{urlencode(params)}"
         return auth_url, state
 
-    async def exchange_code_for_token(self, code: str) -> Optional[str]:
+    async def exchange_code_for_token(self, code: str) -> Optional[Dict[str, Any]]:
         """
-        Exchange authorization code for access token
+        Exchange authorization code for tokens
 
         Args:
             code: Authorization code from Google
 
         Returns:
-            Access token or None if failed
+            Token response (access_token, id_token, ...) or None if failed
         """
         data = {
             "client_id": self.client_id,
@@ -63,23 +87,58 @@ class GoogleOAuthService:
             "redirect_uri": self.redirect_uri
         }
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    self.GOOGLE_TOKEN_URL,
-                    data=data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"}
-                )
+        try:
+            response = await self.client.post(
+                self.GOOGLE_TOKEN_URL,
+                data=data,
+                headers={"Content-Type": "application/x-www-form-urlencoded"}
+            )
 
-                if response.status_code != 200:
-                    return None
-
-                token_data = response.json()
-                return token_data.get("access_token")
+            if response.status_code != 200:
+                return None
 
-            except Exception as e:
-                print(f"Error exchanging code for token: {e}")
+            token_data = response.json()
+            if not token_data.get("access_token"):
                 return None
+            return token_data
+
+        except Exception as e:
+            print(f"Error exchanging code for token: {e}")
+            return None
+
+    def decode_id_token(self, id_token: str) -> Optional[Dict[str, str]]:
+        """
+        Read user info from the OpenID Connect ID token returned with the access token
+
+        The token comes straight from Google's token endpoint over TLS, so per
+        OpenID Connect Core 3.1.3.7 the TLS server check stands in for the
+        signature check; issuer, audience and expiry are still validated.
+
+        Args:
+            id_token: ID token from the token response
+
+        Returns:
+            User info dict, or None if the token is unusable (callers fall back to get_user_info)
+        """
+        try:
+            payload = id_token.split(".")[1]
+            claims = orjson.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        except (IndexError, ValueError, orjson.JSONDecodeError):
+            return None
+
+        if claims.get("iss") not in self.GOOGLE_ISSUERS or claims.get("aud") != self.client_id:
+            return None
+        if not isinstance(claims.get("exp"), int) or claims["exp"] < int(time.time()):
+            return None
+        if not claims.get("sub") or not claims.get("email"):
+            return None
+
+        return {
+            "google_id": claims["sub"],
+            "email": claims["email"],
+            "name": claims.get("name"),
+            "picture_url": claims.get("picture")
+        }
 
     async def get_user_info(self, access_token: str) -> Optional[Dict[str, str]]:
         """
@@ -91,29 +150,28 @@ class GoogleOAuthService:
         Returns:
             User info dict or None if failed
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    self.GOOGLE_USERINFO_URL,
-                    headers={"Authorization": f"Bearer {access_token}"}
-                )
-
-                if response.status_code != 200:
-                    return None
-
-                user_info = response.json()
-
-                return {
-                    "google_id": user_info.get("id"),
-                    "email": user_info.get("email"),
-                    "name": user_info.get("name"),
-                    "picture_url": user_info.get("picture")
-                }
-
-            except Exception as e:
-                print(f"Error fetching user info: {e}")
+        try:
+            response = await self.client.get(
+                self.GOOGLE_USERINFO_URL,
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+
+            if response.status_code != 200:
                 return None
 
+            user_info = response.json()
+
+            return {
+                "google_id": user_info.get("id"),
+                "email": user_info.get("email"),
+                "name": user_info.get("name"),
+                "picture_url": user_info.get("picture")
+            }
+
+        except Exception as e:
+            print(f"Error fetching user info: {e}")
+            return None
+
 
 # Global instance
 google_oauth_service = GoogleOAuthService()
@@ -0,0 +1,123 @@
+"""
+In-process caches for resolving bearer tokens to users.
+
+Token verification results are cached in app.utils.security; this module
+caches the User rows those tokens resolve to, so warm authenticated requests
+need neither HMAC verification nor a SELECT on users.
+
+Email -> user ID mappings live in the shared cache, so lookups by email
+(collaborator invites) become a primary-key load instead of an email scan.
+"""
+import threading
+from typing import Optional
+from uuid import UUID
+from cachetools import TTLCache
+from sqlalchemy import bindparam, func, select
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.user import User
+from app.utils.security import get_user_id_from_token
+from app.utils.shared_cache import cache_get, cache_set
+
+# Detached User instances keyed by user ID, reattached per request via merge()
+_user_cache = TTLCache(maxsize=settings.USER_CACHE_MAX, ttl=settings.USER_CACHE_TTL)
+_user_cache_lock = threading.Lock()
+
+# Built once at import so every lookup hits SQLAlchemy's compiled statement cache
+_select_user_by_id = select(User).where(User.id == bindparam("user_id"))
+_select_user_by_email = select(User).where(func.lower(User.email) == bindparam("email"))
+
+
+def _cache_user(user: User, db: Session) -> User:
+    """Store a freshly loaded user in the user cache and return a session-bound copy"""
+    db.expunge(user)
+    with _user_cache_lock:
+        _user_cache[user.id] = user
+
+    return db.merge(user, load=False)
+
+
+def load_user(user_id: UUID, db: Session) -> Optional[User]:
+    """
+    Load a user by ID, serving repeat lookups from the in-process user cache
+
+    Cached users are kept detached and merged into the request's session
+    without a SELECT, so callers get a normal session-bound User.
+
+    Args:
+        user_id: User ID
+        db: Database session
+
+    Returns:
+        User object or None if not found
+    """
+    with _user_cache_lock:
+        cached = _user_cache.get(user_id)
+
+    if cached is not None:
+        return db.merge(cached, load=False)
+
+    user = db.scalars(_select_user_by_id, {"user_id": user_id}).first()
+    if not user:
+        return None
+
+    return _cache_user(user, db)
+
+
+def _email_cache_key(email: str) -> str:
+    """Shared cache key for an email's user ID"""
+    return f"user_email:{email.lower()}"
+
+
+def remember_user_email(email: str, user_id: UUID) -> None:
+    """Cache the email -> user ID mapping (emails are never changed once set)"""
+    cache_set(_email_cache_key(email), str(user_id), settings.USER_EMAIL_CACHE_TTL)
+
+
+def load_user_by_email(email: str, db: Session) -> Optional[User]:
+    """
+    Load a user by email (case-insensitive), using the email and user caches
+
+    Args:
+        email: Email address
+        db: Database session
+
+    Returns:
+        User object or None if not found
+    """
+    cached_id = cache_get(_email_cache_key(email))
+    if cached_id:
+        user = load_user(UUID(cached_id), db)
+        if user:
+            return user
+
+    user = db.scalars(_select_user_by_email, {"email": email.lower()}).first()
+    if not user:
+        return None
+
+    remember_user_email(user.email, user.id)
+    return _cache_user(user, db)
+
+
+def verify_and_load(token: str, db: Session) -> Optional[User]:
+    """
+    Resolve an access token to its user using the token and user caches
+
+    Args:
+        token: JWT access token
+        db: Database session
+
+    Returns:
+        User object or None if the token is invalid or the user doesn't exist
+    """
+    user_id = get_user_id_from_token(token)
+    if not user_id:
+        return None
+
+    return load_user(user_id, db)
+
+
+def invalidate_cached_user(user_id: UUID) -> None:
+    """Drop a user from the in-process user cache after it has been modified"""
+    with _user_cache_lock:
+        _user_cache.pop(user_id, None)
@@ -3,14 +3,26 @@ Logging configuration for the application.
 
 Sets up separate log files for different log levels:
 - info.log: INFO, WARNING, ERROR, CRITICAL
-- debug.log: All log levels including DEBUG
+- debug.log: DEBUG only
+
+Records are handed to a background QueueListener, so request threads only
+enqueue them and never block on console or file I/O.
 """
+import atexit
 import logging
 import os
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from pathlib import Path
+from typing import Optional
 from app.config import settings
 
+# Set once handlers are attached so re-imports of app.main don't stack duplicates
+_configured = False
+
+# Background thread that owns the real handlers
+_listener: Optional[QueueListener] = None
+
 
 def setup_logging():
     """
@@ -18,10 +30,15 @@ def setup_logging():
 
     Creates two log files:
     - logs/info.log: Contains INFO and above (INFO, WARNING, ERROR, CRITICAL)
-    - logs/debug.log: Contains all levels including DEBUG
+    - logs/debug.log: Contains only DEBUG records (INFO and above are already in info.log)
 
     Both files use rotation to prevent them from growing too large.
+    Calling this more than once is a no-op.
     """
+    global _configured, _listener
+    if _configured:
+        return
+
     # Create logs directory if it doesn't exist
     log_dir = Path(settings.LOG_DIR)
     log_dir.mkdir(exist_ok=True)
@@ -32,6 +49,7 @@ def setup_logging():
 
     # Clear any existing handlers
     root_logger.handlers = []
+    handlers = []
 
     # Format for log messages
     formatter = logging.Formatter(
@@ -44,7 +62,7 @@ def setup_logging():
         console_handler = logging.StreamHandler()
         console_handler.setLevel(settings.LOG_LEVEL)
         console_handler.setFormatter(formatter)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
 
     # File handlers (if enabled)
     if settings.LOG_TO_FILE:
@@ -57,9 +75,9 @@ def setup_logging():
         )
         info_handler.setLevel(logging.INFO)
         info_handler.setFormatter(formatter)
-        root_logger.addHandler(info_handler)
+        handlers.append(info_handler)
 
-        # DEBUG log file - All levels including DEBUG
+        # DEBUG log file - DEBUG only, so INFO+ records aren't written to disk twice
         debug_log_path = log_dir / "debug.log"
         debug_handler = RotatingFileHandler(
             debug_log_path,
@@ -67,13 +85,34 @@ def setup_logging():
             backupCount=settings.LOG_BACKUP_COUNT
         )
         debug_handler.setLevel(logging.DEBUG)
+        debug_handler.addFilter(lambda record: record.levelno == logging.DEBUG)
         debug_handler.setFormatter(formatter)
-        root_logger.addHandler(debug_handler)
+        handlers.append(debug_handler)
+
+    # Root logger only enqueues; the listener thread fans records out to the handlers
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    # Flush the queue on interpreter exit too (scripts, workers killed before lifespan shutdown);
+    # stop_logging is a no-op once the lifespan hook has already stopped the listener
+    atexit.register(stop_logging)
+
+    _configured = True
 
     # Log the initialization
     logging.info(f"Logging initialized - Level: {settings.LOG_LEVEL}, File: {settings.LOG_TO_FILE}, Console: {settings.LOG_TO_CONSOLE}")
 
 
+def stop_logging():
+    """Flush queued log records and stop the background listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger with the specified name.
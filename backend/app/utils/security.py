@@ -1,19 +1,121 @@
 """Security utilities for JWT tokens and password hashing"""
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
-from jose import jwt, JWTError
-from passlib.context import CryptContext
+from typing import Optional, Dict, Any, Tuple
+from argon2 import PasswordHasher, Type
+from argon2.exceptions import InvalidHashError, VerificationError
+from cachetools import TLRUCache
 from app.config import settings
 from uuid import UUID
+import base64
+import binascii
+import functools
+import hashlib
+import hmac
+import orjson
+import re
+import threading
 import time
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing: new hashes use argon2id with the OWASP interactive-login
+# parameters; existing bcrypt hashes still verify and are upgraded on the next login.
+# Both C libraries are called directly; the hash prefix picks the scheme.
+# These are blocking calls, so they're only used from sync (def) routes, which FastAPI runs in
+# its worker threadpool; both libraries release the GIL while hashing, so logins run in parallel.
+_password_hasher = PasswordHasher(
+    type=Type.ID,
+    memory_cost=19456,  # KiB (19 MiB)
+    time_cost=2,
+    parallelism=1
+)
+_BCRYPT_PREFIXES = ("$2a$", "$2b$", "$2y$")
+
+
+# bcrypt and PyJWT (which pulls in cryptography) are imported on first use, so
+# startup doesn't pay for libraries the default configuration never calls
+@functools.lru_cache(maxsize=1)
+def _get_bcrypt():
+    """Import bcrypt; only logins with a legacy bcrypt hash need it"""
+    import bcrypt
+    return bcrypt
+
+
+@functools.lru_cache(maxsize=1)
+def _get_jwt():
+    """Import PyJWT; only JWT_ALGORITHM values other than HS256 need it"""
+    import jwt
+    return jwt
+
+
+# Cache of verified access tokens: blake2b-128(token) -> (user_id, expires_at). Each entry
+# expires at the token's exp or after JWT_CACHE_TTL seconds, whichever comes first, so a
+# hit is a plain lookup with no expiry check of its own.
+_token_cache = TLRUCache(maxsize=settings.JWT_CACHE_MAX, ttu=lambda key, entry, now: entry[1], timer=time.time)
+_token_cache_lock = threading.Lock()
+
+# HS256 tokens are signed and verified with hmac directly; PyJWT is only
+# used for other algorithms. The header and key never change, so encode them once.
+_HS256_HEADER = base64.urlsafe_b64encode(orjson.dumps({"alg": "HS256", "typ": "JWT"})).rstrip(b"=")
+_JWT_KEY = settings.JWT_SECRET.encode()
+
+
+# A JWT segment: unpadded base64url and nothing else
+_B64URL_SEGMENT = re.compile(rb"[A-Za-z0-9_-]*")
+
+
+def _b64url_decode(data: bytes) -> bytes:
+    """
+    Decode unpadded base64url
+
+    urlsafe_b64decode silently drops characters outside the alphabet, so
+    segments are checked against it first.
+
+    Raises:
+        ValueError: If the segment contains anything but base64url characters
+    """
+    if not _B64URL_SEGMENT.fullmatch(data):
+        raise ValueError("Invalid base64url segment")
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _encode_token(payload: Dict[str, Any]) -> str:
+    """Sign a JWT payload with the configured algorithm"""
+    if settings.JWT_ALGORITHM != "HS256":
+        return _get_jwt().encode(payload, settings.JWT_SECRET, algorithm=settings.JWT_ALGORITHM)
+
+    signing_input = _HS256_HEADER + b"." + base64.urlsafe_b64encode(orjson.dumps(payload)).rstrip(b"=")
+    signature = hmac.new(_JWT_KEY, signing_input, hashlib.sha256).digest()
+    return (signing_input + b"." + base64.urlsafe_b64encode(signature).rstrip(b"=")).decode()
+
+
+def _decode_token(token: str) -> Optional[Dict[str, Any]]:
+    """Verify a JWT signature and return its payload, or None if invalid"""
+    if settings.JWT_ALGORITHM != "HS256":
+        jwt = _get_jwt()
+        try:
+            # Expiry is checked by verify_token, as for HS256
+            return jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM], options={"verify_exp": False})
+        except jwt.InvalidTokenError:
+            return None
+
+    try:
+        header, payload, signature = token.encode().split(b".")
+        # Tokens we issue carry exactly our header; anything else must still declare HS256
+        if header != _HS256_HEADER and orjson.loads(_b64url_decode(header)).get("alg") != "HS256":
+            return None
+
+        expected = hmac.new(_JWT_KEY, header + b"." + payload, hashlib.sha256).digest()
+        if not hmac.compare_digest(expected, _b64url_decode(signature)):
+            return None
+
+        claims = orjson.loads(_b64url_decode(payload))
+    except (ValueError, binascii.Error, AttributeError):
+        return None
+
+    return claims if isinstance(claims, dict) else None
 
 
 def create_access_token(user_id: UUID) -> str:
     """Create JWT access token"""
-    expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = int(time.time()) + settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
 
     payload = {
         "sub": str(user_id),
@@ -21,18 +123,12 @@ def create_access_token(user_id: UUID) -> str:
         "type": "access"
     }
 
-    encoded_jwt = jwt.encode(
-        payload,
-        settings.JWT_SECRET,
-        algorithm=settings.JWT_ALGORITHM
-    )
-
-    return encoded_jwt
+    return _encode_token(payload)
 
 
 def create_refresh_token(user_id: UUID) -> str:
     """Create JWT refresh token"""
-    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    expire = int(time.time()) + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
 
     payload = {
         "sub": str(user_id),
@@ -40,41 +136,42 @@ def create_refresh_token(user_id: UUID) -> str:
         "type": "refresh"
     }
 
-    encoded_jwt = jwt.encode(
-        payload,
-        settings.JWT_SECRET,
-        algorithm=settings.JWT_ALGORITHM
-    )
-
-    return encoded_jwt
+    return _encode_token(payload)
 
 
 def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, Any]]:
     """Verify and decode JWT token"""
-    try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
-
-        # Verify token type
-        if payload.get("type") != token_type:
-            return None
-
-        # Verify expiration (compare Unix timestamps to avoid timezone issues)
-        exp = payload.get("exp")
-        if not exp or int(time.time()) > exp:
-            return None
+    payload = _decode_token(token)
+    if payload is None:
+        return None
 
-        return payload
+    # Verify token type
+    if payload.get("type") != token_type:
+        return None
 
-    except JWTError:
+    # Verify expiration (compare Unix timestamps to avoid timezone issues)
+    exp = payload.get("exp")
+    if not isinstance(exp, (int, float)) or int(time.time()) > exp:
         return None
 
+    return payload
+
 
 def get_user_id_from_token(token: str) -> Optional[UUID]:
-    """Extract user ID from JWT token"""
+    """
+    Extract user ID from JWT access token
+
+    Successfully verified tokens are cached for JWT_CACHE_TTL seconds (never
+    past their exp) so repeat requests skip signature verification.
+    """
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+    with _token_cache_lock:
+        cached = _token_cache.get(cache_key)
+
+    if cached is not None:
+        return cached[0]
+
     payload = verify_token(token)
 
     if not payload:
@@ -85,16 +182,52 @@ def get_user_id_from_token(token: str) -> Optional[UUID]:
         return None
 
     try:
-        return UUID(user_id_str)
+        user_id = UUID(user_id_str)
     except (ValueError, AttributeError):
         return None
 
+    expires_at = min(payload["exp"], time.time() + settings.JWT_CACHE_TTL)
+    with _token_cache_lock:
+        _token_cache[cache_key] = (user_id, expires_at)
+
+    return user_id
+
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    return pwd_context.hash(password)
+    """Hash a password using argon2id"""
+    return _password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash (argon2 or legacy bcrypt)"""
+    if hashed_password.startswith(_BCRYPT_PREFIXES):
+        try:
+            return _get_bcrypt().checkpw(plain_password.encode(), hashed_password.encode())
+        except ValueError:
+            return False
+
+    try:
+        return _password_hasher.verify(hashed_password, plain_password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and produce a replacement hash if the stored one is outdated
+
+    Args:
+        plain_password: Password supplied by the user
+        hashed_password: Stored hash (argon2 or legacy bcrypt)
+
+    Returns:
+        (valid, new_hash) where new_hash is set when the caller should store it
+    """
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+
+    # Legacy bcrypt hashes, and argon2 hashes made with older parameters, are replaced
+    if hashed_password.startswith(_BCRYPT_PREFIXES) or _password_hasher.check_needs_rehash(hashed_password):
+        return True, hash_password(plain_password)
+
+    return True, None
@@ -0,0 +1,196 @@
+"""
+Small key/value cache shared by all worker processes.
+
+Uses Redis when REDIS_URL is configured, so every gunicorn worker sees the
+same entries and the same invalidations. Without it, falls back to an
+in-process cache, which is fine for a single worker or local development.
+
+Values are strings; callers own their key prefixes and serialization.
+Redis errors are logged and treated as cache misses so requests fall back
+to the database instead of failing.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+import redis
+from cachetools import TLRUCache
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Redis client with its own connection pool, or None to use the local fallback
+_redis: Optional[redis.Redis] = redis.Redis.from_url(
+    settings.REDIS_URL,
+    decode_responses=True,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT,
+) if settings.REDIS_URL else None
+
+# Whether every worker sees the same entries; without Redis, only when there is one worker
+SHARED_ACROSS_WORKERS = _redis is not None or int(os.environ.get("WEB_CONCURRENCY", "1")) <= 1
+
+# Local fallback: entries are (value, expires_at) and expire individually
+_local = TLRUCache(maxsize=settings.SHARED_CACHE_MAX, ttu=lambda key, entry, now: entry[1], timer=time.monotonic)
+# Single-use values (cache_set_once/cache_pop) get their own store so the
+# entries above can never evict them before they're consumed
+_local_once = TLRUCache(maxsize=settings.SHARED_CACHE_ONCE_MAX, ttu=lambda key, entry, now: entry[1], timer=time.monotonic)
+_local_lock = threading.Lock()
+
+
+def cache_get(key: str) -> Optional[str]:
+    """
+    Get a cached value
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Cached string or None on a miss
+    """
+    if _redis is not None:
+        try:
+            return _redis.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Redis GET {key} failed: {e}")
+            return None
+
+    with _local_lock:
+        entry = _local.get(key)
+    return entry[0] if entry else None
+
+
+def cache_set(key: str, value: str, ttl: int) -> None:
+    """
+    Store a value for ttl seconds
+
+    Args:
+        key: Cache key
+        value: String value
+        ttl: Time to live in seconds
+    """
+    if _redis is not None:
+        try:
+            _redis.setex(key, ttl, value)
+        except redis.RedisError as e:
+            logger.warning(f"Redis SETEX {key} failed: {e}")
+        return
+
+    with _local_lock:
+        _local[key] = (value, time.monotonic() + ttl)
+
+
+def cache_set_once(key: str, value: str, ttl: int) -> None:
+    """
+    Store a single-use value for ttl seconds, to be consumed with cache_pop
+
+    Args:
+        key: Cache key
+        value: String value
+        ttl: Time to live in seconds
+    """
+    if _redis is not None:
+        try:
+            _redis.setex(key, ttl, value)
+        except redis.RedisError as e:
+            logger.warning(f"Redis SETEX {key} failed: {e}")
+        return
+
+    with _local_lock:
+        _local_once[key] = (value, time.monotonic() + ttl)
+
+
+def cache_pop(key: str) -> Optional[str]:
+    """
+    Get a value stored with cache_set_once and remove it atomically, so it can be consumed only once
+
+    Args:
+        key: Cache key
+
+    Returns:
+        Cached string or None on a miss
+    """
+    if _redis is not None:
+        try:
+            pipe = _redis.pipeline(transaction=True)
+            pipe.get(key)
+            pipe.delete(key)
+            value, _ = pipe.execute()
+            return value
+        except redis.RedisError as e:
+            logger.warning(f"Redis GET/DEL {key} failed: {e}")
+            return None
+
+    with _local_lock:
+        entry = _local_once.pop(key, None)
+    return entry[0] if entry else None
+
+
+def cache_get_many(keys: List[str]) -> List[Optional[str]]:
+    """
+    Get several cached values in one round trip (MGET)
+
+    Args:
+        keys: Cache keys
+
+    Returns:
+        Values in the same order as keys, None for misses
+    """
+    if not keys:
+        return []
+
+    if _redis is not None:
+        try:
+            return _redis.mget(keys)
+        except redis.RedisError as e:
+            logger.warning(f"Redis MGET of {len(keys)} keys failed: {e}")
+            return [None] * len(keys)
+
+    with _local_lock:
+        entries = [_local.get(key) for key in keys]
+    return [entry[0] if entry else None for entry in entries]
+
+
+def cache_set_many(values: Dict[str, str], ttl: int) -> None:
+    """
+    Store several values for ttl seconds in one round trip (pipelined SETEX)
+
+    Args:
+        values: Mapping of cache key to string value
+        ttl: Time to live in seconds
+    """
+    if not values:
+        return
+
+    if _redis is not None:
+        try:
+            pipe = _redis.pipeline(transaction=False)
+            for key, value in values.items():
+                pipe.setex(key, ttl, value)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Redis SETEX of {len(values)} keys failed: {e}")
+        return
+
+    expires_at = time.monotonic() + ttl
+    with _local_lock:
+        for key, value in values.items():
+            _local[key] = (value, expires_at)
+
+
+def cache_delete(*keys: str) -> None:
+    """Remove keys from the cache (missing keys are ignored)"""
+    if not keys:
+        return
+
+    if _redis is not None:
+        try:
+            _redis.delete(*keys)
+        except redis.RedisError as e:
+            logger.warning(f"Redis DEL {keys} failed: {e}")
+        return
+
+    with _local_lock:
+        for key in keys:
+            _local.pop(key, None)
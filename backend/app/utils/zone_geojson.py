@@ -0,0 +1,50 @@
+"""
+Cached GeoJSON serialization of zone geometries.
+
+ST_AsGeoJSON on large polygons is comparatively expensive, and zone geometry
+never changes after a KML import (zones are only created and deleted, and IDs
+are never reused), so the serialized text is kept in the shared cache.
+"""
+from typing import Dict, Iterable
+from uuid import UUID
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.zone import Zone
+from app.utils.shared_cache import cache_get_many, cache_set_many
+
+
+def _cache_key(zone_id: UUID) -> str:
+    """Shared cache key for a zone's GeoJSON"""
+    return f"geojson:zone:{zone_id}"
+
+
+def get_zone_geojson(zone_ids: Iterable[UUID], db: Session) -> Dict[UUID, str]:
+    """
+    Get GeoJSON text for zones, serializing only cache misses in PostGIS
+
+    Args:
+        zone_ids: Zone IDs (duplicates are fine)
+        db: Database session
+
+    Returns:
+        Mapping of zone ID to GeoJSON string (zones that don't exist are omitted)
+    """
+    ids = list(dict.fromkeys(zone_ids))
+    cached = cache_get_many([_cache_key(zone_id) for zone_id in ids])
+    result = {zone_id: geojson for zone_id, geojson in zip(ids, cached) if geojson is not None}
+
+    missing = [zone_id for zone_id in ids if zone_id not in result]
+    if missing:
+        fetched = dict(
+            db.query(Zone.id, func.ST_AsGeoJSON(Zone.geometry))
+            .filter(Zone.id.in_(missing))
+            .all()
+        )
+        cache_set_many(
+            {_cache_key(zone_id): geojson for zone_id, geojson in fetched.items()},
+            settings.ZONE_GEOJSON_CACHE_TTL
+        )
+        result.update(fetched)
+
+    return result
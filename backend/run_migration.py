@@ -2,10 +2,11 @@
 """Run database migration"""
 import sys
 from pathlib import Path
-from sqlalchemy import create_engine, text
+import sqlparse
+from sqlalchemy import create_engine
 from app.config import settings
 
-def run_migration(migration_file: str):
+def run_migration(migration_file: str, verbose: bool = False):
     """Run a SQL migration file"""
     # Read migration file
     migration_path = Path(__file__).parent.parent / "database" / "migrations" / migration_file
@@ -24,16 +25,27 @@ def run_migration(migration_file: str):
     print(f"Running migration: {migration_file}")
     print("-" * 60)
 
-    try:
-        with engine.connect() as conn:
-            # Split by semicolon and execute each statement
-            statements = [s.strip() for s in sql.split(';') if s.strip() and not s.strip().startswith('--')]
+    # psql meta-commands (e.g. \c flyers_db) aren't SQL; the engine is already connected
+    sql = "\n".join(line for line in sql.splitlines() if not line.lstrip().startswith("\\"))
+
+    # sqlparse keeps semicolons inside strings and $$-quoted function bodies intact;
+    # comment-only fragments are dropped
+    statements = [
+        statement for statement in sqlparse.split(sql)
+        if sqlparse.format(statement, strip_comments=True).strip()
+    ]
 
-            for statement in statements:
-                if statement:
+    try:
+        # One transaction for the whole file: a single commit at the end, and a
+        # failing statement rolls back everything before it (PostgreSQL DDL is transactional)
+        with engine.begin() as conn:
+            if verbose:
+                for statement in statements:
                     print(f"Executing: {statement[:100]}...")
-                    conn.execute(text(statement))
-                    conn.commit()
+
+            # The whole script goes to the server in one round trip; no_parameters
+            # keeps the driver from treating % in the SQL as a placeholder
+            conn.execution_options(no_parameters=True).exec_driver_sql("\n".join(statements))
 
         print("-" * 60)
         print("SUCCESS: Migration completed successfully!")
@@ -44,9 +56,11 @@ def run_migration(migration_file: str):
         sys.exit(1)
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python run_migration.py <migration_file>")
+    verbose = any(arg in ("-v", "--verbose") for arg in sys.argv[1:])
+    args = [arg for arg in sys.argv[1:] if arg not in ("-v", "--verbose")]
+    if len(args) != 1:
+        print("Usage: python run_migration.py [-v|--verbose] <migration_file>")
         print("Example: python run_migration.py 03-rename-metadata-columns.sql")
         sys.exit(1)
 
-    run_migration(sys.argv[1])
+    run_migration(args[0], verbose=verbose)
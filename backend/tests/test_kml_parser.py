@@ -0,0 +1,39 @@
+"""Tests for the KML parser"""
+import os
+
+from app.utils.kml_parser import iter_kml_zones
+
+
+XXE_KML = """<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE kml [<!ENTITY xxe SYSTEM "file:///tmp/secret.txt">]>
+<kml xmlns="http://www.opengis.net/kml/2.2">
+  <Document>
+    <Placemark>
+      <name>&xxe;</name>
+      <Polygon>
+        <outerBoundaryIs>
+          <LinearRing>
+            <coordinates>-122.0,47.0,0 -122.1,47.0,0 -122.1,47.1,0 -122.0,47.0,0</coordinates>
+          </LinearRing>
+        </outerBoundaryIs>
+      </Polygon>
+    </Placemark>
+  </Document>
+</kml>
+"""
+
+
+def test_external_entities_are_not_resolved():
+    """A DOCTYPE entity pointing at a local file must not leak its contents into zones"""
+    with open("/tmp/secret.txt", "w") as f:
+        f.write("top-secret")
+
+    try:
+        errors = []
+        zones = list(iter_kml_zones(XXE_KML, errors))
+    finally:
+        os.remove("/tmp/secret.txt")
+
+    # The entity is left unexpanded, so the name is empty and the placemark is rejected
+    assert zones == []
+    assert errors == ["Failed to parse placemark: Unknown"]
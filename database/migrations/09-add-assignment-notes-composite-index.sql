@@ -0,0 +1,8 @@
+-- Add composite index for listing an assignment's notes newest-first
+-- Lets "WHERE assignment_id = ? ORDER BY created_at DESC" use an ordered index scan instead of filter + sort
+
+CREATE INDEX IF NOT EXISTS idx_assignment_notes_assignment_created
+    ON assignment_notes(assignment_id, created_at DESC);
+
+-- The composite index covers assignment_id lookups on its own
+DROP INDEX IF EXISTS idx_assignment_notes_assignment_id;
@@ -0,0 +1,15 @@
+-- Generate primary keys in the database with gen_random_uuid()
+-- The ORM no longer binds Python-generated UUIDs on INSERT; ids come back via RETURNING
+-- gen_random_uuid() is built in from PostgreSQL 13; pgcrypto provides it on older servers
+
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+ALTER TABLE users ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE projects ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE project_collaborators ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE zones ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE zone_assignments ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE assignment_notes ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE houses ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE house_visits ALTER COLUMN id SET DEFAULT gen_random_uuid();
+ALTER TABLE completion_areas ALTER COLUMN id SET DEFAULT gen_random_uuid();
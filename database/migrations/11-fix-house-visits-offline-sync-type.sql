@@ -0,0 +1,12 @@
+-- Make house_visits.offline_sync a NOT NULL boolean
+-- Databases built from the ORM models got VARCHAR(50) holding 'False'/'True'; the USING cast handles both
+
+ALTER TABLE house_visits ALTER COLUMN offline_sync DROP DEFAULT;
+
+ALTER TABLE house_visits
+ALTER COLUMN offline_sync TYPE BOOLEAN USING COALESCE(offline_sync::text::boolean, false);
+
+UPDATE house_visits SET offline_sync = false WHERE offline_sync IS NULL;
+
+ALTER TABLE house_visits ALTER COLUMN offline_sync SET DEFAULT false;
+ALTER TABLE house_visits ALTER COLUMN offline_sync SET NOT NULL;
@@ -0,0 +1,13 @@
+-- Add composite indexes for the zone_assignments lookups used by the assignments router
+-- (zone_id, volunteer_id, status): duplicate-assignment check and per-zone volunteer exclusion
+-- (volunteer_id, status): my-assignments and active-assignment counts per volunteer
+
+CREATE INDEX IF NOT EXISTS idx_zone_assignments_zone_volunteer_status
+    ON zone_assignments(zone_id, volunteer_id, status);
+
+CREATE INDEX IF NOT EXISTS idx_zone_assignments_volunteer_status
+    ON zone_assignments(volunteer_id, status);
+
+-- The composite indexes lead with zone_id / volunteer_id, so they cover these single-column lookups
+DROP INDEX IF EXISTS idx_zone_assignments_zone_id;
+DROP INDEX IF EXISTS idx_zone_assignments_volunteer_id;
@@ -0,0 +1,9 @@
+-- Enforce at most one active (not completed) assignment per volunteer per zone
+-- create_assignment relies on this instead of a SELECT pre-check; a violation is returned as 400
+-- If this fails, resolve existing duplicates first:
+--   SELECT zone_id, volunteer_id, COUNT(*) FROM zone_assignments
+--   WHERE status != 'completed' GROUP BY zone_id, volunteer_id HAVING COUNT(*) > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_zone_assignments_active_unique
+    ON zone_assignments(zone_id, volunteer_id)
+    WHERE status != 'completed';
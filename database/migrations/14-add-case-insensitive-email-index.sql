@@ -0,0 +1,10 @@
+-- Case-insensitive email lookups for login, register and collaborator invites
+-- The auth queries match on lower(email), so they need an expression index to avoid a sequential scan
+-- If this fails, resolve emails that differ only by case first:
+--   SELECT lower(email), COUNT(*) FROM users GROUP BY lower(email) HAVING COUNT(*) > 1;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_email_lower ON users(lower(email));
+
+-- The UNIQUE constraints on email and google_id already provide B-tree indexes
+DROP INDEX IF EXISTS idx_users_email;
+DROP INDEX IF EXISTS idx_users_google_id;
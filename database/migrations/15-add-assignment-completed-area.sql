@@ -0,0 +1,12 @@
+-- Store each assignment's merged completion area so the progress endpoint doesn't re-union every call
+-- The completions router recomputes it whenever a completion area is added or deleted
+
+ALTER TABLE zone_assignments ADD COLUMN IF NOT EXISTS completed_area_sqm DOUBLE PRECISION NOT NULL DEFAULT 0;
+
+-- Backfill existing assignments
+UPDATE zone_assignments za
+SET completed_area_sqm = COALESCE((
+    SELECT ST_Area(ST_UnaryUnion(ST_Collect(ca.geometry)))
+    FROM completion_areas ca
+    WHERE ca.assignment_id = za.id
+), 0);
@@ -0,0 +1,11 @@
+-- Covering index for the (project_id, user_id) lookup behind every project access check,
+-- collaborator listing and invite check
+-- INCLUDE (role) lets an index-only scan answer the role check without visiting the table
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_project_collaborators_project_user
+    ON project_collaborators(project_id, user_id) INCLUDE (role);
+
+-- The new unique index enforces one membership per user and leads with project_id,
+-- so the original UNIQUE constraint and the single-column project_id index are redundant
+ALTER TABLE project_collaborators DROP CONSTRAINT IF EXISTS project_collaborators_project_id_user_id_key;
+DROP INDEX IF EXISTS idx_project_collaborators_project_id;
@@ -9,135 +9,526 @@ import time
 import subprocess
 import signal
 import re
+import threading
+import socket
+import tempfile
+import ctypes
+from ctypes import wintypes
 from pathlib import Path
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import PatternMatchingEventHandler
 
 
-def kill_processes_on_port(port=8000):
-    """Kill any processes listening on the specified port."""
+_SEP = os.sep  # Separator in watchdog event paths
+
+# Port lookup / kill commands and patterns
+_NETSTAT_ARGS = ['netstat', '-ano', '-p', 'TCP']  # Numeric, IPv4 TCP only; the backend listens on 0.0.0.0
+_LISTENING = b'LISTENING'
+_TASKKILL_PREFIX = ['taskkill', '/F']
+_PID_RE = re.compile(rb'\d+')
+
+# Console banners, composed once; each is sent with a single write
+_BANNER_START = "\n" + "="*60 + "\nStarting backend server...\n" + "="*60 + "\n"
+_BANNER_END = "="*60 + "\n\n"
+_BANNER_RESTART = "\n" + "~"*60 + "\nCode changes detected - restarting backend...\n" + "~"*60 + "\n"
+
+
+# Runs in the backend's venv Python: imports the app's heavy third-party dependencies,
+# then waits for "start" on stdin before handing over to the uvicorn CLI. The app package
+# itself is only imported after "start", so each restart still loads fresh code.
+_PREWARM_CODE = """
+import sys
+for name in ("fastapi", "uvicorn", "pydantic", "sqlalchemy", "geoalchemy2", "psycopg2",
+             "shapely", "numpy", "lxml.etree", "orjson", "argon2", "httpx", "redis"):
+    try:
+        __import__(name)
+    except ImportError:
+        pass
+if sys.stdin.readline().strip() != "start":
+    sys.exit(0)
+import uvicorn
+# No --reload flag - the watcher handles restarts
+sys.argv = ["uvicorn", "app.main:app", "--host", "0.0.0.0", "--port", "8000"]
+uvicorn.main()
+"""
+
+
+# IP Helper API (iphlpapi.dll) constants for GetExtendedTcpTable
+TCP_TABLE_OWNER_PID_LISTENER = 3
+NO_ERROR = 0
+ERROR_INSUFFICIENT_BUFFER = 122
+
+
+class MIB_TCPROW_OWNER_PID(ctypes.Structure):
+    """One row of the IPv4 TCP table (ports are in network byte order)."""
+    _fields_ = [
+        ('dwState', wintypes.DWORD),
+        ('dwLocalAddr', wintypes.DWORD),
+        ('dwLocalPort', wintypes.DWORD),
+        ('dwRemoteAddr', wintypes.DWORD),
+        ('dwRemotePort', wintypes.DWORD),
+        ('dwOwningPid', wintypes.DWORD),
+    ]
+
+
+class MIB_TCP6ROW_OWNER_PID(ctypes.Structure):
+    """One row of the IPv6 TCP table (ports are in network byte order)."""
+    _fields_ = [
+        ('ucLocalAddr', ctypes.c_ubyte * 16),
+        ('dwLocalScopeId', wintypes.DWORD),
+        ('dwLocalPort', wintypes.DWORD),
+        ('ucRemoteAddr', ctypes.c_ubyte * 16),
+        ('dwRemoteScopeId', wintypes.DWORD),
+        ('dwRemotePort', wintypes.DWORD),
+        ('dwState', wintypes.DWORD),
+        ('dwOwningPid', wintypes.DWORD),
+    ]
+
+
+def _listening_pids_iphlpapi(port):
+    """
+    Find PIDs listening on a TCP port with GetExtendedTcpTable.
+
+    The kernel hands back a table of listening sockets only, so there is no
+    netstat process to spawn and no text to parse. Raises OSError if the call fails.
+    """
+    get_table = ctypes.windll.iphlpapi.GetExtendedTcpTable
+    pids = set()
+
+    for family, row_type in ((socket.AF_INET, MIB_TCPROW_OWNER_PID),
+                             (socket.AF_INET6, MIB_TCP6ROW_OWNER_PID)):
+        size = wintypes.DWORD(0)
+        buf = None
+        # The first call reports the size needed; retry if the table grows in between
+        while True:
+            ret = get_table(buf, ctypes.byref(size), False, family, TCP_TABLE_OWNER_PID_LISTENER, 0)
+            if ret != ERROR_INSUFFICIENT_BUFFER:
+                break
+            buf = ctypes.create_string_buffer(size.value)
+
+        if ret != NO_ERROR:
+            raise OSError(f"GetExtendedTcpTable failed with error {ret}")
+        if buf is None:
+            continue
+
+        # MIB_TCPTABLE_OWNER_PID: a DWORD entry count followed by the rows
+        num_entries = wintypes.DWORD.from_buffer(buf).value
+        rows = (row_type * num_entries).from_buffer(buf, ctypes.sizeof(wintypes.DWORD))
+        for row in rows:
+            if socket.ntohs(row.dwLocalPort & 0xFFFF) == port:
+                pids.add(row.dwOwningPid)
+
+    return pids
+
+
+def _listening_pids_netstat(port):
+    """Find PIDs listening on a TCP port by parsing netstat output (None if netstat fails)."""
+    result = subprocess.run(
+        _NETSTAT_ARGS,
+        capture_output=True,
+        timeout=5
+    )
+
+    if result.returncode != 0:
+        return None
+
+    # Parse netstat output to find PIDs listening on port. Cheap substring checks
+    # skip the other rows before any splitting; the trailing space keeps :8000
+    # from matching :80001
+    needle = f':{port} '.encode()
+    pids = set()
+    for line in result.stdout.splitlines():
+        if _LISTENING not in line or needle not in line:
+            continue
+        # Extract PID (last column) without splitting the rest of the row
+        try:
+            pids.add(int(line.rsplit(None, 1)[1]))
+        except (ValueError, IndexError):
+            continue
+
+    return pids
+
+
+def _listening_pids_procfs(port):
+    """
+    Find PIDs listening on a TCP port from /proc (Linux/WSL), without spawning anything.
+
+    Listening sockets' inodes come from /proc/net/tcp and tcp6; the owning
+    processes are the ones with an fd linked to socket:[inode].
+    """
+    inodes = set()
+    for table in ('/proc/net/tcp', '/proc/net/tcp6'):
+        try:
+            with open(table) as f:
+                next(f)  # Column header
+                for line in f:
+                    # local_address is hexaddr:hexport; st 0A is LISTEN; inode is column 10
+                    fields = line.split()
+                    if fields[3] == '0A' and int(fields[1].rsplit(':', 1)[1], 16) == port:
+                        inodes.add(fields[9])
+        except FileNotFoundError:
+            continue
+
+    if not inodes:
+        return set()
+
+    targets = {f'socket:[{inode}]' for inode in inodes}
+    pids = set()
+    for entry in os.scandir('/proc'):
+        if not entry.name.isdigit():
+            continue
+        try:
+            for fd in os.scandir(f'/proc/{entry.name}/fd'):
+                if os.readlink(fd.path) in targets:
+                    pids.add(int(entry.name))
+                    break
+        except OSError:
+            # Process exited, or its fds belong to another user
+            continue
+
+    return pids
+
+
+def _kill_pids_taskkill(pids):
+    """Kill PIDs with one taskkill (Windows)."""
+    # taskkill prints a SUCCESS line per terminated PID on stdout and reports failures on stderr
     try:
-        # Use netstat to find processes on port
         result = subprocess.run(
-            ['netstat', '-ano'],
+            _TASKKILL_PREFIX + [arg for pid in pids for arg in ('/PID', str(pid))],
             capture_output=True,
-            text=True,
             timeout=5
         )
+        killed = {int(n) for n in _PID_RE.findall(result.stdout)} & pids
+        for pid in sorted(pids):
+            if pid in killed:
+                print(f"  Killed PID {pid}")
+            else:
+                print(f"  Could not kill PID {pid}")
+    except Exception as e:
+        print(f"  Could not kill PIDs {sorted(pids)}: {e}")
+
+
+def _kill_pids_signal(pids):
+    """Send SIGTERM to each PID (non-Windows)."""
+    for pid in sorted(pids):
+        try:
+            os.kill(pid, signal.SIGTERM)
+            print(f"  Killed PID {pid}")
+        except OSError as e:
+            print(f"  Could not kill PID {pid}: {e}")
+
+
+def kill_processes_on_port(port=8000):
+    """Kill any processes listening on the specified port."""
+    try:
+        if sys.platform == "win32":
+            # IP Helper API first; netstat is only the fallback
+            pids = None
+            try:
+                pids = _listening_pids_iphlpapi(port)
+            except OSError as e:
+                print(f"Warning: IP Helper lookup failed, falling back to netstat: {e}")
 
-        if result.returncode != 0:
+            if pids is None:
+                pids = _listening_pids_netstat(port)
+                if pids is None:
+                    return
+            kill = _kill_pids_taskkill
+        elif os.path.isdir('/proc/net'):
+            pids = _listening_pids_procfs(port)
+            kill = _kill_pids_signal
+        else:
             return
 
-        # Parse netstat output to find PIDs listening on port
-        pids = set()
-        for line in result.stdout.split('\n'):
-            if f':{port}' in line and 'LISTENING' in line:
-                # Extract PID (last column)
-                parts = line.split()
-                if parts:
-                    try:
-                        pid = int(parts[-1])
-                        pids.add(pid)
-                    except (ValueError, IndexError):
-                        continue
-
-        # Kill each process
         if pids:
             print(f"\nKilling {len(pids)} process(es) on port {port}...")
-            for pid in pids:
-                try:
-                    subprocess.run(
-                        ['taskkill', '/F', '/PID', str(pid)],
-                        capture_output=True,
-                        timeout=5
-                    )
-                    print(f"  Killed PID {pid}")
-                except Exception as e:
-                    print(f"  Could not kill PID {pid}: {e}")
+            kill(pids)
             print()
     except Exception as e:
         print(f"Warning: Could not kill processes on port {port}: {e}")
 
 
-class BackendRestartHandler(FileSystemEventHandler):
+# Job Object API (kernel32.dll) constants and structures
+JobObjectExtendedLimitInformation = 9
+JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x2000
+CREATE_SUSPENDED = 0x00000004
+
+
+class JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+    _fields_ = [
+        ('PerProcessUserTimeLimit', wintypes.LARGE_INTEGER),
+        ('PerJobUserTimeLimit', wintypes.LARGE_INTEGER),
+        ('LimitFlags', wintypes.DWORD),
+        ('MinimumWorkingSetSize', ctypes.c_size_t),
+        ('MaximumWorkingSetSize', ctypes.c_size_t),
+        ('ActiveProcessLimit', wintypes.DWORD),
+        ('Affinity', ctypes.c_size_t),
+        ('PriorityClass', wintypes.DWORD),
+        ('SchedulingClass', wintypes.DWORD),
+    ]
+
+
+class IO_COUNTERS(ctypes.Structure):
+    _fields_ = [
+        ('ReadOperationCount', ctypes.c_ulonglong),
+        ('WriteOperationCount', ctypes.c_ulonglong),
+        ('OtherOperationCount', ctypes.c_ulonglong),
+        ('ReadTransferCount', ctypes.c_ulonglong),
+        ('WriteTransferCount', ctypes.c_ulonglong),
+        ('OtherTransferCount', ctypes.c_ulonglong),
+    ]
+
+
+class JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+    _fields_ = [
+        ('BasicLimitInformation', JOBOBJECT_BASIC_LIMIT_INFORMATION),
+        ('IoInfo', IO_COUNTERS),
+        ('ProcessMemoryLimit', ctypes.c_size_t),
+        ('JobMemoryLimit', ctypes.c_size_t),
+        ('PeakProcessMemoryUsed', ctypes.c_size_t),
+        ('PeakJobMemoryUsed', ctypes.c_size_t),
+    ]
+
+
+def _kernel32():
+    """kernel32 with handle-sized return types, so 64-bit handles aren't truncated."""
+    kernel32 = ctypes.WinDLL('kernel32', use_last_error=True)
+    kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    kernel32.CreateJobObjectW.argtypes = [wintypes.LPVOID, wintypes.LPCWSTR]
+    kernel32.SetInformationJobObject.argtypes = [wintypes.HANDLE, ctypes.c_int, wintypes.LPVOID, wintypes.DWORD]
+    kernel32.AssignProcessToJobObject.argtypes = [wintypes.HANDLE, wintypes.HANDLE]
+    kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+    return kernel32
+
+
+def _kill_on_close_job(process):
+    """
+    Put a (suspended) process in a Job Object that kills it when the handle closes.
+
+    Children inherit the job, so closing the handle takes down the whole tree at
+    once, including the interpreter a venv's python.exe launcher starts. Returns
+    the job handle, or None if the job couldn't be set up.
+    """
+    kernel32 = _kernel32()
+    job = kernel32.CreateJobObjectW(None, None)
+    if not job:
+        return None
+
+    info = JOBOBJECT_EXTENDED_LIMIT_INFORMATION()
+    info.BasicLimitInformation.LimitFlags = JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+    if not (kernel32.SetInformationJobObject(job, JobObjectExtendedLimitInformation,
+                                             ctypes.byref(info), ctypes.sizeof(info))
+            and kernel32.AssignProcessToJobObject(job, int(process._handle))):
+        kernel32.CloseHandle(job)
+        return None
+
+    return job
+
+
+def _resume_process(process):
+    """Resume a process started with CREATE_SUSPENDED."""
+    ctypes.windll.ntdll.NtResumeProcess(wintypes.HANDLE(int(process._handle)))
+
+
+class BackendRestartHandler(PatternMatchingEventHandler):
     """Handles file system events and restarts the backend."""
 
     def __init__(self, backend_dir, venv_python):
+        # Only *.py file events are dispatched to the on_* methods; directory
+        # events, bytecode caches and editor lock/backup files are dropped inside watchdog
+        super().__init__(
+            patterns=['*.py'],
+            ignore_patterns=['*/__pycache__/*', '*/.git/*', '*/.#*', '*.pyc', '*.swp', '*.tmp', '*~'],
+            ignore_directories=True,
+            case_sensitive=False
+        )
         self.backend_dir = backend_dir
         self.venv_python = venv_python
+        # Stringified once; start_backend passes them to Popen on every restart
+        self._backend_dir_str = str(backend_dir)
+        self._venv_python_str = str(venv_python)
+        # The backend writes its bytecode caches outside backend/app, so restarts
+        # don't generate __pycache__ events in the watched tree at all
+        self._backend_env = dict(
+            os.environ,
+            PYTHONPYCACHEPREFIX=os.path.join(tempfile.gettempdir(), "scouting-flyers-pycache")
+        )
         self.process = None
-        self.restart_pending = False
-        self.last_restart_time = 0
-        self.debounce_seconds = 2  # Wait 2s between restarts
+        self._job = None  # Job Object owning the backend's process tree
+        # (process, job) pre-warmed and waiting to become the next backend
+        self._spare = None
+        # True once we've stopped our own backend cleanly, so nothing can be left on the port
+        self._port_known_clean = False
+        self.debounce_seconds = 2  # Restart once changes have been quiet for 2s
+        self.max_restart_interval = 10  # ...but no later than 10s after the first change
+        # Pending restart; rescheduled on every event so a burst restarts once, at its end
+        self._timer = None
+        self._first_event_time = None
+        # Files changed since the last restart; repeat events for one file are ignored
+        self._pending_paths = set()
+        self._lock = threading.Lock()
+        # Serializes restarts if a new one comes due while the last is still stopping the server
+        self._restart_lock = threading.Lock()
 
     def start_backend(self):
         """Start the backend server."""
         if self.process:
             self.stop_backend()
 
-        # Kill any stale processes on port 8000
-        kill_processes_on_port(8000)
-
-        print("\n" + "="*60)
-        print(f"Starting backend server...")
-        print("="*60)
-
-        cmd = [
-            str(self.venv_python),
-            "-m", "uvicorn",
-            "app.main:app",
-            "--host", "0.0.0.0",
-            "--port", "8000"
-            # No --reload flag - we handle restarts manually
-        ]
-
-        self.process = subprocess.Popen(
-            cmd,
-            cwd=str(self.backend_dir),
-            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP
+        # Kill any stale processes on port 8000, unless our own backend was the
+        # last listener and it's known to be gone (first start always checks)
+        if not self._port_known_clean:
+            kill_processes_on_port(8000)
+        self._port_known_clean = False
+
+        sys.stdout.write(_BANNER_START)
+        sys.stdout.flush()
+
+        # Hand over to the spare that has been importing dependencies since the
+        # last start; if it's gone (first start, or it died), use a new one
+        self.process, self._job = self._take_spare()
+        sys.stdout.write(f"Backend started (PID: {self.process.pid})\n" + _BANNER_END)
+        sys.stdout.flush()
+
+        # Warm up the next backend while this one runs
+        self._spare = self._spawn_backend_process()
+
+    def _spawn_backend_process(self):
+        """Start a pre-warming backend process; returns (process, job)."""
+        # Start suspended so the process is in the job before it can spawn children
+        process = subprocess.Popen(
+            [self._venv_python_str, "-c", _PREWARM_CODE],
+            cwd=self._backend_dir_str,
+            env=self._backend_env,
+            stdin=subprocess.PIPE,
+            creationflags=subprocess.CREATE_NEW_PROCESS_GROUP | CREATE_SUSPENDED
         )
-        print(f"Backend started (PID: {self.process.pid})")
-        print("="*60 + "\n")
+        try:
+            job = _kill_on_close_job(process)
+        finally:
+            _resume_process(process)
+        return process, job
+
+    def _take_spare(self):
+        """Tell the spare backend process to start uvicorn; returns (process, job)."""
+        spare, self._spare = self._spare, None
+        if spare and spare[0].poll() is not None:
+            # The spare exited while waiting (e.g. a dependency failed to import)
+            self._discard(*spare)
+            spare = None
+
+        process, job = spare or self._spawn_backend_process()
+        process.stdin.write(b"start\n")
+        process.stdin.close()
+        return process, job
+
+    def discard_spare(self):
+        """Stop the pre-warmed spare process, if any."""
+        if self._spare:
+            self._discard(*self._spare)
+            self._spare = None
+
+    @staticmethod
+    def _discard(process, job):
+        """Kill a backend process that never became the running server."""
+        if job:
+            _kernel32().CloseHandle(job)
+        else:
+            process.kill()
+        process.wait(timeout=5)
 
     def stop_backend(self):
-        """Stop the backend server gracefully."""
+        """Stop the backend server and everything it started."""
         if self.process:
             print("\nStopping backend...")
-            try:
-                self.process.send_signal(signal.CTRL_BREAK_EVENT)
-                self.process.wait(timeout=5)
-            except:
-                self.process.kill()
+            if self._job:
+                # Closing the job handle kills the whole process tree immediately
+                _kernel32().CloseHandle(self._job)
+                self._job = None
+                try:
+                    self.process.wait(timeout=5)
+                    self._port_known_clean = True
+                except subprocess.TimeoutExpired:
+                    pass
+            else:
+                # No job (setup failed): ask uvicorn to shut down, then force it.
+                # Only a graceful exit is known to have taken the launcher's child with it
+                try:
+                    self.process.send_signal(signal.CTRL_BREAK_EVENT)
+                    self.process.wait(timeout=5)
+                    self._port_known_clean = True
+                except (subprocess.TimeoutExpired, OSError):
+                    self.process.kill()
             self.process = None
             print("Backend stopped\n")
 
     def restart_backend(self):
-        """Restart the backend server with debouncing."""
-        current_time = time.time()
+        """
+        Schedule a restart for when changes have stopped for debounce_seconds.
 
-        # Debounce: don't restart too frequently
-        if current_time - self.last_restart_time < self.debounce_seconds:
-            self.restart_pending = True
-            return
+        Continuous changes can't defer it forever: it fires at most
+        max_restart_interval seconds after the first change of the burst.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._timer:
+                self._timer.cancel()
+            if self._first_event_time is None:
+                self._first_event_time = now
 
-        self.last_restart_time = current_time
-        self.restart_pending = False
+            deadline = self._first_event_time + self.max_restart_interval
+            delay = min(self.debounce_seconds, max(0, deadline - now))
+            self._timer = threading.Timer(delay, self._do_restart)
+            self._timer.daemon = True
+            self._timer.start()
 
-        print("\n" + "~"*60)
-        print("Code changes detected - restarting backend...")
-        print("~"*60)
+    def cancel_pending_restart(self):
+        """Drop a scheduled restart, if any."""
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            self._first_event_time = None
+            self._pending_paths.clear()
 
-        self.start_backend()
+    def _do_restart(self):
+        """Restart the backend server (runs on the debounce timer thread)."""
+        with self._lock:
+            self._timer = None
+            self._first_event_time = None
+            # File names by slicing: watchdog reports paths with the platform separator
+            changed = sorted(path.rpartition(_SEP)[2] for path in self._pending_paths)
+            self._pending_paths.clear()
+
+        with self._restart_lock:
+            # The change summary and the restart banner go out as one console write
+            output = ""
+            if changed:
+                shown = ", ".join(changed[:5])
+                more = f" ... and {len(changed) - 5} more" if len(changed) > 5 else ""
+                output = f"Changed ({len(changed)} file{'s' if len(changed) != 1 else ''}): {shown}{more}\n"
+            output += _BANNER_RESTART
+            sys.stdout.write(output)
+            sys.stdout.flush()
+
+            self.start_backend()
 
     def on_modified(self, event):
-        """Handle file modification events."""
-        if event.is_directory:
-            return
+        """Handle file modification events (only .py files reach here)."""
+        # Moves report the new name; editors that save via rename end up here too
+        path = getattr(event, 'dest_path', '') or event.src_path
+
+        # A save usually fires several events for the same file; only the first
+        # one in the current window schedules the restart
+        with self._lock:
+            if path in self._pending_paths:
+                return
+            self._pending_paths.add(path)
+
+        self.restart_backend()
 
-        # Only restart for Python files
-        if event.src_path.endswith('.py'):
-            print(f"Changed: {Path(event.src_path).name}")
-            self.restart_backend()
+    # New files and save-by-rename (write temp file, move over original) restart too
+    on_created = on_moved = on_modified
 
 def main():
     """Main entry point."""
@@ -179,17 +570,17 @@ def main():
     observer.start()
 
     try:
+        # Restarts are driven by the handler's debounce timer; this thread only
+        # waits for Ctrl+C. time.sleep wakes on Ctrl+C straight away on Windows too,
+        # where an untimed Event.wait() can't be interrupted, so it can sleep long
         while True:
-            time.sleep(1)
-            # Process pending restart if debounce period has passed
-            if handler.restart_pending:
-                current_time = time.time()
-                if current_time - handler.last_restart_time >= handler.debounce_seconds:
-                    handler.restart_backend()
+            time.sleep(3600)
     except KeyboardInterrupt:
         print("\n\nShutting down...")
         observer.stop()
+        handler.cancel_pending_restart()
         handler.stop_backend()
+        handler.discard_spare()
 
     observer.join()
     print("Watcher stopped\n")
@@ -54,6 +54,54 @@ if errorlevel 1 goto error
 echo [32m✓[0m 08-add-assignment-notes-table.sql completed successfully
 echo.
 
+echo Running migration: 09-add-assignment-notes-composite-index.sql
+python run_migration.py ../database/migrations/09-add-assignment-notes-composite-index.sql
+if errorlevel 1 goto error
+echo [32m✓[0m 09-add-assignment-notes-composite-index.sql completed successfully
+echo.
+
+echo Running migration: 10-server-side-uuid-defaults.sql
+python run_migration.py ../database/migrations/10-server-side-uuid-defaults.sql
+if errorlevel 1 goto error
+echo [32m✓[0m 10-server-side-uuid-defaults.sql completed successfully
+echo.
+
+echo Running migration: 11-fix-house-visits-offline-sync-type.sql
+python run_migration.py ../database/migrations/11-fix-house-visits-offline-sync-type.sql
+if errorlevel 1 goto error
+echo [32m✓[0m 11-fix-house-visits-offline-sync-type.sql completed successfully
+echo.
+
+echo Running migration: 12-add-zone-assignment-composite-indexes.sql
+python run_migration.py ../database/migrations/12-add-zone-assignment-composite-indexes.sql
+if errorlevel 1 goto error
+echo [32m✓[0m 12-add-zone-assignment-composite-indexes.sql completed successfully
+echo.
+
+echo Running migration: 13-add-unique-active-assignment-index.sql
+python run_migration.py ../database/migrations/13-add-unique-active-assignment-index.sql
+if errorlevel 1 goto error
+echo [32m✓[0m 13-add-unique-active-assignment-index.sql completed successfully
+echo.
+
+echo Running migration: 14-add-case-insensitive-email-index.sql
+python run_migration.py ../database/migrations/14-add-case-insensitive-email-index.sql
+if errorlevel 1 goto error
+echo [32m✓[0m 14-add-case-insensitive-email-index.sql completed successfully
+echo.
+
+echo Running migration: 15-add-assignment-completed-area.sql
+python run_migration.py ../database/migrations/15-add-assignment-completed-area.sql
+if errorlevel 1 goto error
+echo [32m✓[0m 15-add-assignment-completed-area.sql completed successfully
+echo.
+
+echo Running migration: 16-add-collaborator-covering-index.sql
+python run_migration.py ../database/migrations/16-add-collaborator-covering-index.sql
+if errorlevel 1 goto error
+echo [32m✓[0m 16-add-collaborator-covering-index.sql completed successfully
+echo.
+
 echo [32mAll migrations completed successfully![0m
 cd ..
 goto end
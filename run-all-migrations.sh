@@ -17,6 +17,14 @@ migrations=(
     "06-add-assignment-notes-and-percentage.sql"
     "07-add-project-status-enum.sql"
     "08-add-assignment-notes-table.sql"
+    "09-add-assignment-notes-composite-index.sql"
+    "10-server-side-uuid-defaults.sql"
+    "11-fix-house-visits-offline-sync-type.sql"
+    "12-add-zone-assignment-composite-indexes.sql"
+    "13-add-unique-active-assignment-index.sql"
+    "14-add-case-insensitive-email-index.sql"
+    "15-add-assignment-completed-area.sql"
+    "16-add-collaborator-covering-index.sql"
 )
 
 for migration in "${migrations[@]}"; do